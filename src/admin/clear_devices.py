@@ -7,35 +7,57 @@ import json
 import base64
 from pathlib import Path
 
-# Decode the base64 key
+# Base64-encoded service account key
 key_b64_path = Path(__file__).parent.parent / "Codes" / "firebase-key-b64.txt"
-with open(key_b64_path, encoding='utf-8-sig') as f:
-    key_text = f.read().strip()
-    key_json = base64.b64decode(key_text).decode('utf-8')
-
-# Initialize Firebase
-cred = firebase_admin.credentials.Certificate(json.loads(key_json))
-firebase_admin.initialize_app(cred)
-
-# Delete devices from Firestore
-db = firestore.client()
-print("Deleting /devices from Firestore...")
-try:
-    devices = db.collection('devices').stream()
-    for doc in devices:
-        doc.reference.delete()
-    print("✅ Devices deleted successfully from Firestore")
-except Exception as e:
-    print(f"ℹ️  /devices already empty or doesn't exist: {e}")
-
-
-# Verify deletion
-ref = db.reference('/devices')
-try:
-    data = ref.get()
-    print(f"Remaining data: {data}")
-except Exception as e:
-    print(f"✅ Devices cleared - /devices is now empty")
-
-firebase_admin.delete_app(firebase_admin.get_app())
-print("Done!")
+
+# Firestore caps a write batch at 500 operations
+BATCH_LIMIT = 500
+# A handful of deletes is faster as direct calls than a batch commit
+SMALL_DELETE_COUNT = 4
+
+
+def main():
+    """Delete every /devices document and verify the collection is empty"""
+    # Decode the base64 key
+    with open(key_b64_path, encoding='utf-8-sig') as f:
+        key_text = f.read().strip()
+        key_json = base64.b64decode(key_text).decode('utf-8')
+
+    # Initialize Firebase
+    cred = firebase_admin.credentials.Certificate(json.loads(key_json))
+    firebase_admin.initialize_app(cred)
+
+    # Delete devices from Firestore
+    db = firestore.client()
+    print("Deleting /devices from Firestore...")
+    try:
+        refs = [doc.reference for doc in db.collection('devices').stream()]
+        if len(refs) <= SMALL_DELETE_COUNT:
+            for ref in refs:
+                ref.delete()
+        else:
+            for start in range(0, len(refs), BATCH_LIMIT):
+                batch = db.batch()
+                for ref in refs[start:start + BATCH_LIMIT]:
+                    batch.delete(ref)
+                batch.commit()
+        print(f"✅ {len(refs)} devices deleted successfully from Firestore")
+    except Exception as e:
+        print(f"ℹ️  /devices already empty or doesn't exist: {e}")
+
+    # Verify deletion
+    try:
+        remaining = db.collection('devices').limit(1).get()
+        if remaining:
+            print(f"Remaining data: {[doc.id for doc in remaining]}")
+        else:
+            print(f"✅ Devices cleared - /devices is now empty")
+    except Exception as e:
+        print(f"⚠️  Could not verify deletion: {e}")
+
+    firebase_admin.delete_app(firebase_admin.get_app())
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
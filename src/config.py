@@ -18,6 +18,10 @@ BASE_DIR = Path(__file__).parent.resolve()
 HARDWARE_PLATFORM = os.getenv("HARDWARE_PLATFORM", "raspberry_pi")
 SIMULATE_HARDWARE = os.getenv("SIMULATE_HARDWARE", "false").lower() == "true"
 
+# Hardware module this Pi drives ("grow" or "motor"). Some GPIOs mean different
+# things per module (GPIO13: LED relay vs motor direction); unset = combined table
+MODULE_KIND = os.getenv("MODULE_KIND", "").strip().lower() or None
+
 # Hardware Serial Detection (Primary Device Identifier)
 def _get_hardware_serial() -> str:
     """Get Raspberry Pi hardware serial with smart fallback strategy.
@@ -62,10 +62,9 @@ class RaspServer:
             # Connect to Firebase
             self.firebase.connect()
             
-            # Pass Firestore DB to services that need it
+            # Pass the Firebase service's Firestore client to services that need it
+            firestore_db = self.firebase.firestore_db
             try:
-                from firebase_admin import firestore
-                firestore_db = firestore.client()
                 self.sensors = SensorService(
                     firestore_db=firestore_db,
                     hardware_serial=config.HARDWARE_SERIAL
@@ -87,7 +86,7 @@ class RaspServer:
             
             # Connect GPIO Actuator Controller (real-time Firestore listener)
             # This loads pins from Firestore, initializes hardware, starts listeners
-            self.gpio_actuator.connect()
+            self.gpio_actuator.connect(firestore_db=firestore_db)
             logger.info("GPIO Actuator Controller connected — listening to Firestore")
             
             # Set Firebase status in diagnostics
@@ -1,10 +1,13 @@
 """Command and device models"""
 
-from dataclasses import dataclass, asdict
+import copy
+from dataclasses import dataclass
 from typing import Any, Dict
 
+from ..utils.compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class Command:
     """Command from cloud agent"""
     category: str  # "irrigation", "lighting", "harvest"
@@ -13,11 +16,16 @@ class Command:
     timestamp: str
     
     def to_dict(self):
-        """Convert to dictionary"""
-        return asdict(self)
+        """Convert to dictionary (params is deep-copied, like asdict())"""
+        return {
+            "category": self.category,
+            "action": self.action,
+            "params": copy.deepcopy(self.params) if self.params is not None else None,
+            "timestamp": self.timestamp,
+        }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class DeviceStatus:
     """Device status snapshot"""
     device_id: str
@@ -27,4 +35,9 @@ class DeviceStatus:
     
     def to_dict(self):
         """Convert to dictionary"""
-        return asdict(self)
+        return {
+            "device_id": self.device_id,
+            "status": self.status,
+            "last_seen": self.last_seen,
+            "current_operation": self.current_operation,
+        }
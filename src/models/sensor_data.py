@@ -1,11 +1,13 @@
 """Sensor data models and schemas"""
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+from ..utils.compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class SensorReading:
     """Sensor reading data"""
     timestamp: str
@@ -16,15 +18,22 @@ class SensorReading:
     simulation: bool = False
     
     def to_dict(self):
-        """Convert to dictionary"""
-        return asdict(self)
+        """Convert to dictionary (flat fields, so no recursive asdict walk)"""
+        return {
+            "timestamp": self.timestamp,
+            "temperature": self.temperature,
+            "humidity": self.humidity,
+            "soil_moisture": self.soil_moisture,
+            "water_level": self.water_level,
+            "simulation": self.simulation,
+        }
     
     def to_json(self):
         """Convert to JSON-serializable dict"""
         return self.to_dict()
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ThresholdAlert:
     """Alert when sensor reading exceeds thresholds"""
     severity: str  # "warning" or "critical"
@@ -34,5 +43,11 @@ class ThresholdAlert:
     timestamp: str
     
     def to_dict(self):
-        """Convert to dictionary"""
-        return asdict(self)
+        """Convert to dictionary (flat fields, so no recursive asdict walk)"""
+        return {
+            "severity": self.severity,
+            "sensor_type": self.sensor_type,
+            "current_value": self.current_value,
+            "threshold": self.threshold,
+            "timestamp": self.timestamp,
+        }
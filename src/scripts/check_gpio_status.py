@@ -107,6 +107,12 @@ def get_gpio_states_from_hardware():
         print(f"{Colors.YELLOW}[~] Hardware GPIO check unavailable: {e}{Colors.END}")
         return None
 
+# ON/OFF indicator per pin state
+STATE_INDICATORS = {
+    True: f"{Colors.GREEN}🟢 ON {Colors.END}",
+    False: f"{Colors.RED}⚫ OFF{Colors.END}",
+}
+
 def print_header():
     """Print header"""
     print(f"\n{Colors.CYAN}{'='*60}")
@@ -116,25 +122,23 @@ def print_header():
     print(f"Device ID: {config.HARDWARE_SERIAL}")
     print()
 
+def _pin_sort_key(item):
+    return int(item[0])
+
 def print_pin_group(group_name, pins_dict):
-    """Print a group of pins"""
-    print(f"{Colors.BOLD}{group_name}{Colors.END}")
-    print("-" * 60)
+    """Print a group of pins (built up and written in one call)"""
+    lines = [f"{Colors.BOLD}{group_name}{Colors.END}", "-" * 60]
     
-    for pin_str in sorted(pins_dict.keys(), key=lambda x: int(x)):
-        pin_data = pins_dict[pin_str]
-        
+    for pin_str, pin_data in sorted(pins_dict.items(), key=_pin_sort_key):
         if isinstance(pin_data, dict):
-            state = pin_data.get('state', False)
             name = pin_data.get('name', 'Unknown Device')
             
             # Visual indicator
-            if state:
-                indicator = f"{Colors.GREEN}🟢 ON {Colors.END}"
-            else:
-                indicator = f"{Colors.RED}⚫ OFF{Colors.END}"
+            indicator = STATE_INDICATORS[bool(pin_data.get('state', False))]
             
-            print(f"  GPIO{pin_str:2s}: {indicator}  {name}")
+            lines.append(f"  GPIO{pin_str:2s}: {indicator}  {name}")
+    
+    print("\n".join(lines))
 
 def main():
     """Main function"""
@@ -15,6 +15,7 @@ import sys
 import json
 import subprocess
 import logging
+import tempfile
 from datetime import datetime
 from pathlib import Path
 
@@ -25,6 +26,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Static platform fields stamped on the device document and its mapping
+PLATFORM_FIELDS = {"platform": "raspberry_pi", "os": "linux"}
+
+
+def _atomic_write(path: Path, payload: bytes):
+    """Write payload to path via temp file + rename (no torn file on power loss)"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 
 class PiInitializer:
     """Initialize and register Pi with Firestore"""
@@ -34,6 +55,7 @@ class PiInitializer:
         self.pi_serial = None
         self.pi_mac = None
         self.pi_hostname = None
+        self.pi_ip = None
         self.config_device_id = None
         self.firestore = None
         
@@ -78,13 +100,16 @@ class PiInitializer:
             return "unknown"
     
     def get_ip_address(self) -> str:
-        """Get primary IP address"""
+        """Get primary IP address (looked up once per run)"""
+        if self.pi_ip is not None:
+            return self.pi_ip
         try:
             ip = subprocess.check_output(
                 "hostname -I | awk '{print $1}'",
                 shell=True
             ).decode().strip()
             logger.info(f"✅ Got IP: {ip}")
+            self.pi_ip = ip
             return ip
         except Exception as e:
             logger.error(f"❌ Could not get IP: {e}")
@@ -146,59 +171,46 @@ class PiInitializer:
             doc_ref = self.firestore.collection('devices').document(doc_id)
             existing_doc = doc_ref.get()
             
+            # Identity/status fields written on every boot
+            hardware_serial = self.pi_serial or self.config_device_id
+            now_iso = datetime.now().isoformat()
+            identity_data = {
+                "hardware_serial": hardware_serial,
+                "deviceId": self.config_device_id,
+                "deviceName": self.config_device_id,
+                "mac_address": self.pi_mac,
+                "hostname": self.pi_hostname,
+                "ip_address": self.get_ip_address(),
+                "status": "online",
+                "lastHeartbeat": now_iso,
+                "mapping": {
+                    "hardware_serial": hardware_serial,
+                    "config_id": self.config_device_id,
+                    "mac": self.pi_mac,
+                    "hostname": self.pi_hostname,
+                    **PLATFORM_FIELDS,
+                },
+            }
+            
             if existing_doc.exists:
                 # Device already registered — only update identity/status fields
                 # NEVER overwrite gpioState, config, or user-configured data
-                update_data = {
-                    "hardware_serial": self.pi_serial or self.config_device_id,
-                    "deviceId": self.config_device_id,
-                    "deviceName": self.config_device_id,
-                    "mac_address": self.pi_mac,
-                    "hostname": self.pi_hostname,
-                    "ip_address": self.get_ip_address(),
-                    "status": "online",
-                    "lastHeartbeat": datetime.now().isoformat(),
-                    "mapping": {
-                        "hardware_serial": self.pi_serial or self.config_device_id,
-                        "config_id": self.config_device_id,
-                        "mac": self.pi_mac,
-                        "hostname": self.pi_hostname,
-                        "platform": "raspberry_pi",
-                        "os": "linux",
-                    },
-                }
-                doc_ref.set(update_data, merge=True)
+                doc_ref.set(identity_data, merge=True)
                 logger.info(f"✅ Device already registered — updated identity fields: devices/{doc_id}")
             else:
                 # First-time registration — create full document
                 device_data = {
-                    "hardware_serial": self.pi_serial or self.config_device_id,
-                    "deviceId": self.config_device_id,
-                    "deviceName": self.config_device_id,
-                    "mac_address": self.pi_mac,
-                    "hostname": self.pi_hostname,
-                    "ip_address": self.get_ip_address(),
-                    "status": "online",
-                    "lastHeartbeat": datetime.now().isoformat(),
-                    "registered_at": datetime.now().isoformat(),
-                    "initialized_at": datetime.now().isoformat(),
-                    "platform": "raspberry_pi",
-                    "os": "linux",
-                    "mapping": {
-                        "hardware_serial": self.pi_serial or self.config_device_id,
-                        "config_id": self.config_device_id,
-                        "mac": self.pi_mac,
-                        "hostname": self.pi_hostname,
-                        "platform": "raspberry_pi",
-                        "os": "linux",
-                    },
+                    **identity_data,
+                    "registered_at": now_iso,
+                    "initialized_at": now_iso,
+                    **PLATFORM_FIELDS,
                     # Empty gpioState — ONLY on first registration
                     # Webapp will add pins, Pi will read them dynamically
                     "gpioState": {}
                 }
                 doc_ref.set(device_data)
                 logger.info(f"✅ First-time registration in Firestore: devices/{doc_id}")
-            logger.info(f"   Hardware Serial: {device_data['hardware_serial']}")
+            logger.info(f"   Hardware Serial: {hardware_serial}")
             logger.info(f"   Device ID: {self.config_device_id}")
             logger.info("")
             logger.info("📋 NEXT STEPS:")
@@ -214,7 +226,7 @@ class PiInitializer:
             return False
     
     def save_device_info(self):
-        """Save device info to local file for reference"""
+        """Save device info to local file for reference (skipped if unchanged)"""
         try:
             device_info = {
                 "pi_serial": self.pi_serial,
@@ -222,13 +234,26 @@ class PiInitializer:
                 "hostname": self.pi_hostname,
                 "ip_address": self.get_ip_address(),
                 "config_device_id": self.config_device_id,
-                "registered_at": datetime.now().isoformat(),
             }
             
-            # Save to local file
             info_path = Path(__file__).parent.parent / '.device_info.json'
-            with open(info_path, 'w') as f:
-                json.dump(device_info, f, indent=2)
+            
+            # Same identity as last boot → keep the file (saves an SD-card write)
+            try:
+                with open(info_path, 'r') as f:
+                    saved_info = json.load(f)
+                saved_info.pop("registered_at", None)
+                if saved_info == device_info:
+                    logger.info(f"✅ Device info unchanged: {info_path}")
+                    return True
+            except (OSError, ValueError, AttributeError):
+                pass  # Missing/corrupt file → rewrite it
+            
+            device_info["registered_at"] = datetime.now().isoformat()
+            
+            # Save to local file
+            payload = json.dumps(device_info, indent=2).encode('utf-8') + b'\n'
+            _atomic_write(info_path, payload)
             
             logger.info(f"✅ Device info saved to {info_path}")
             return True
@@ -72,13 +72,19 @@ class ConfigManager:
         self._loading = True
         try:
             if self.firestore_db:
-                # First, ensure device document exists
                 device_doc_ref = (
                     self.firestore_db.collection("devices")
                     .document(self.hardware_serial)
                 )
-                device_doc = device_doc_ref.get()
+                config_doc_ref = device_doc_ref.collection("config").document("intervals")
+                
+                # The two reads are independent — fetch them concurrently
+                device_doc, config_doc = await asyncio.gather(
+                    asyncio.to_thread(device_doc_ref.get),
+                    asyncio.to_thread(config_doc_ref.get),
+                )
                 
+                # First, ensure device document exists
                 if not device_doc.exists:
                     # Create device doc with initial config
                     logger.info(f"Device doc doesn't exist, creating with defaults...")
@@ -92,9 +98,6 @@ class ConfigManager:
                     logger.info(f"Device doc exists, checking for missing config...")
                 
                 # Now ensure config/intervals subcollection exists
-                config_doc_ref = device_doc_ref.collection("config").document("intervals")
-                config_doc = config_doc_ref.get()
-                
                 if not config_doc.exists:
                     # Create intervals doc with defaults
                     logger.info(f"Creating /config/intervals with defaults: {self.DEFAULT_INTERVALS}")
@@ -196,18 +199,12 @@ class ConfigManager:
         return None
 
     async def _cache_locally(self, config: Dict[str, float]):
-        """Cache configuration in local SQLite database (async version)."""
+        """Cache configuration in local SQLite database (async version).
+        
+        The SQLite write runs in a worker thread so it never stalls the event loop.
+        """
         try:
-            with self.database._get_connection() as conn:
-                cursor = conn.cursor()
-                for key, value in config.items():
-                    cursor.execute(
-                        """
-                        INSERT OR REPLACE INTO device_config 
-                        (key, value, source) VALUES (?, ?, ?)
-                        """,
-                        (key, str(value), "firestore"),
-                    )
+            await asyncio.to_thread(self._write_cache, config)
             logger.debug(f"✓ Cached config locally: {config}")
         except Exception as e:
             logger.error(f"✗ Failed to cache config locally: {e}")
@@ -215,20 +212,22 @@ class ConfigManager:
     def _update_local_cache_sync(self, config: Dict[str, float]):
         """Cache configuration in local SQLite database (sync version for listener context)."""
         try:
-            with self.database._get_connection() as conn:
-                cursor = conn.cursor()
-                for key, value in config.items():
-                    cursor.execute(
-                        """
-                        INSERT OR REPLACE INTO device_config 
-                        (key, value, source) VALUES (?, ?, ?)
-                        """,
-                        (key, str(value), "firestore"),
-                    )
+            self._write_cache(config)
             logger.info(f"✓ Synced config to local cache: {config}")
         except Exception as e:
             logger.error(f"✗ Failed to sync config to local cache: {e}")
 
+    def _write_cache(self, config: Dict[str, float]):
+        """Write all config keys to device_config in a single transaction."""
+        with self.database._get_connection() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO device_config 
+                (key, value, source) VALUES (?, ?, ?)
+                """,
+                [(key, str(value), "firestore") for key, value in config.items()],
+            )
+
     def _validate_config(self, config: Dict[str, float]) -> Optional[Dict[str, float]]:
         """
         Validate configuration values.
@@ -293,7 +292,10 @@ class ConfigManager:
                             logger.info(f"✓ Config change detected in Firestore: {new_config}")
                             
                             validated = self._validate_config(new_config)
-                            if validated:
+                            if validated and validated == self.intervals:
+                                # Initial snapshot or a no-op write - nothing to re-cache
+                                logger.debug("Config unchanged, skipping local cache write")
+                            elif validated:
                                 old_intervals = self.intervals.copy()
                                 self.intervals = validated
                                 logger.info(
@@ -358,7 +360,7 @@ class ConfigManager:
     def get_heartbeat_interval(self) -> float:
         """Get heartbeat interval in seconds - reads current value from self.intervals."""
         interval = self.intervals.get("heartbeat_interval_s", self.DEFAULT_INTERVALS["heartbeat_interval_s"])
-        logger.debug(f"📍 Heartbeat interval = {interval}s (from config: {self.intervals})")
+        logger.debug("📍 Heartbeat interval = %ss (from config: %s)", interval, self.intervals)
         return interval
 
     def get_metrics_interval(self) -> float:
@@ -1,6 +1,7 @@
 """Firebase service - abstracts Firebase operations"""
 
 import json
+import functools
 import logging
 import asyncio
 import platform
@@ -16,6 +17,37 @@ from ..models import SensorReading, Command, DeviceStatus
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _static_hardware_info() -> dict:
+    """Hardware/OS facts that cannot change while the process is running."""
+    # All 26 usable BCM GPIO pins on a standard Pi 40-pin header
+    ALL_BCM_PINS = list(range(2, 28))  # GPIO2–GPIO27
+    
+    hw_info = {
+        "python_version": platform.python_version(),
+        "os_version": platform.platform(),
+        "hostname": socket.gethostname(),
+        "all_gpio_pins": ALL_BCM_PINS,
+        "total_gpio_pins": len(ALL_BCM_PINS),
+    }
+    
+    # Try to get RPi-specific info
+    try:
+        import RPi.GPIO as GPIO
+        rpi = GPIO.RPI_INFO
+        hw_info.update({
+            "pi_model": rpi.get('TYPE', 'Unknown'),
+            "pi_processor": rpi.get('PROCESSOR', 'Unknown'),
+            "pi_ram": rpi.get('RAM', 'Unknown'),
+            "pi_manufacturer": rpi.get('MANUFACTURER', 'Unknown'),
+            "pi_revision": rpi.get('REVISION', 'Unknown'),
+        })
+    except Exception:
+        hw_info["pi_model"] = "Unknown (RPi.GPIO unavailable)"
+    
+    return hw_info
+
+
 class FirebaseService:
     """High-level Firebase service for data sync and commands"""
     
@@ -25,6 +57,7 @@ class FirebaseService:
         self.hardware_serial = config.HARDWARE_SERIAL  # Primary identifier
         self.device_id = config.DEVICE_ID  # Human-readable alias (stored in document)
         self.callbacks = {}
+        self._identity_written = False  # device_id/hardware_serial already on the device doc
         
         logger.info(f"Firebase service initialized (hardware_serial: {self.hardware_serial}, device_id: {self.device_id})")
     
@@ -99,33 +132,11 @@ class FirebaseService:
         """Collect Pi hardware info: model, processor, RAM, GPIO pins, OS, Python.
         
         This data is written to Firestore so the webapp knows the Pi's capabilities.
+        The static part is probed once per process; only the IP is re-read.
         """
-        # All 26 usable BCM GPIO pins on a standard Pi 40-pin header
-        ALL_BCM_PINS = list(range(2, 28))  # GPIO2–GPIO27
-        
-        hw_info = {
-            "python_version": platform.python_version(),
-            "os_version": platform.platform(),
-            "hostname": socket.gethostname(),
-            "all_gpio_pins": ALL_BCM_PINS,
-            "total_gpio_pins": len(ALL_BCM_PINS),
-        }
-        
-        # Try to get RPi-specific info
-        try:
-            import RPi.GPIO as GPIO
-            rpi = GPIO.RPI_INFO
-            hw_info.update({
-                "pi_model": rpi.get('TYPE', 'Unknown'),
-                "pi_processor": rpi.get('PROCESSOR', 'Unknown'),
-                "pi_ram": rpi.get('RAM', 'Unknown'),
-                "pi_manufacturer": rpi.get('MANUFACTURER', 'Unknown'),
-                "pi_revision": rpi.get('REVISION', 'Unknown'),
-            })
-        except Exception:
-            hw_info["pi_model"] = "Unknown (RPi.GPIO unavailable)"
+        hw_info = dict(_static_hardware_info())
         
-        # Try to get IP address
+        # Try to get IP address (can change between reconnects)
         try:
             s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             s.connect(('8.8.8.8', 80))
@@ -158,6 +169,7 @@ class FirebaseService:
             self.firestore_db.collection("devices").document(
                 self.hardware_serial
             ).set(update_data, merge=True)
+            self._identity_written = True
             logger.info(f"Device status updated to: {status} (serial: {self.hardware_serial})")
         except Exception as e:
             logger.error(f"Failed to update device status: {e}")
@@ -217,12 +229,12 @@ class FirebaseService:
             action = cmd_data.get("action")
             params = cmd_data.get("params", {})
             
-            callback_key = f"{cmd_type}/{action}"
+            callback = self.callbacks.get((cmd_type, action))
             
-            if callback_key in self.callbacks:
-                self.callbacks[callback_key](params)
+            if callback is not None:
+                callback(params)
             else:
-                logger.warning(f"No handler for: {callback_key}")
+                logger.warning(f"No handler for: {cmd_type}/{action}")
                 
         except Exception as e:
             logger.error(f"Error routing command: {e}")
@@ -252,23 +264,31 @@ class FirebaseService:
                     logger.error(f"Reconnection failed: {reconnect_error}")
                     return
             
-            self.firestore_db.collection("devices").document(
-                self.hardware_serial
-            ).set({
+            device_ref = self.firestore_db.collection("devices").document(self.hardware_serial)
+            heartbeat = {
                 "status": "online",
-                "device_id": self.device_id,
-                "hardware_serial": self.hardware_serial,
                 "lastHeartbeat": SERVER_TIMESTAMP,
-            }, merge=True)
+            }
+            if self._identity_written:
+                # Identity fields never change — only send the hot fields
+                # (merge, not update: a deleted device doc is recreated, not NotFound)
+                device_ref.set(heartbeat, merge=True)
+            else:
+                device_ref.set({
+                    **heartbeat,
+                    "device_id": self.device_id,
+                    "hardware_serial": self.hardware_serial,
+                }, merge=True)
+                self._identity_written = True
             logger.info(f"✓ Heartbeat published to Firestore (serial: {self.hardware_serial})")
         except Exception as e:
             logger.error(f"✗ Failed to publish heartbeat: {e}", exc_info=True)
             # Mark connection as invalid so next heartbeat will attempt reconnect
             self.connected = False
+            self._identity_written = False
             logger.warning("Firebase connection marked as invalid - will reconnect on next heartbeat")
     
     def register_command_handler(self, cmd_type: str, action: str, callback):
         """Register handler for command type/action"""
-        key = f"{cmd_type}/{action}"
-        self.callbacks[key] = callback
-        logger.info(f"Registered handler for {key}")
\ No newline at end of file
+        self.callbacks[(cmd_type, action)] = callback
+        logger.info(f"Registered handler for {cmd_type}/{action}")
\ No newline at end of file
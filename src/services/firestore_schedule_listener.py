@@ -158,7 +158,7 @@ class FirestoreScheduleListener:
                 firestore_schedules = pin_data.get('schedules', {})
                 
                 # Get cached schedules for this pin
-                cached_schedules = {s.schedule_id: s for s in self.schedule_cache.get_pin_schedules(gpio_num)}
+                cached_schedules = self.schedule_cache.get_pin_schedule_map(gpio_num)
                 
                 # ──────────────────────────────────────────────────────────────
                 # DETECT ADDITIONS & MODIFICATIONS
@@ -174,7 +174,7 @@ class FirestoreScheduleListener:
                             self.schedule_cache.update_schedule(gpio_num, schedule_id, schedule_def)
                             
                             # Clear user override — user explicitly created a schedule, they want it to run
-                            if hasattr(self, '_controller') and self._controller:
+                            if self._controller:
                                 self._controller._user_override_pins.discard(gpio_num)
                                 logger.info(f"✅ Cleared user override on GPIO{gpio_num} (new schedule created)")
                             
@@ -202,7 +202,7 @@ class FirestoreScheduleListener:
                                         # If enabled status changed or time window changed, potentially re-execute
                                         if 'enabled' in changed or 'start_time' in changed or 'end_time' in changed:
                                             # Clear override when schedule is re-enabled
-                                            if updated_sched.is_active and hasattr(self, '_controller') and self._controller:
+                                            if updated_sched.is_active and self._controller:
                                                 self._controller._user_override_pins.discard(gpio_num)
                                                 logger.info(f"✅ Cleared user override on GPIO{gpio_num} (schedule re-enabled)")
                                             if updated_sched.is_active:
@@ -28,9 +28,10 @@ NAMING SYSTEM:
 """
 
 import logging
+import queue
 import threading
 import time
-from typing import Dict, Callable, Optional, Any
+from typing import Dict, Callable, List, Optional, Any
 from datetime import datetime
 import firebase_admin
 from firebase_admin import firestore
@@ -45,6 +46,65 @@ logger = logging.getLogger(__name__)
 # Local hardware read interval (fast, in-memory only, no Firestore write)
 LOCAL_HARDWARE_READ_INTERVAL = 5.0
 
+# Firestore caps a write batch at 500 operations
+FIRESTORE_BATCH_LIMIT = 500
+
+# Daemon threads shared by fire-and-forget Firestore writes
+FIRESTORE_WRITE_WORKERS = 4
+
+
+class _DaemonWorkerPool:
+    """Fire-and-forget task pool backed by daemon threads.
+    
+    concurrent.futures workers are joined at interpreter exit, so a Firestore
+    write queued while offline could hold up shutdown; daemon threads don't.
+    Workers are started on demand, up to max_workers.
+    """
+    
+    def __init__(self, max_workers: int, name: str):
+        self._max_workers = max_workers
+        self._name = name
+        self._tasks: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._idle = 0
+        self._closed = False
+    
+    def submit(self, fn: Callable[[], None]):
+        """Queue fn to run on a worker (RuntimeError once shut down)"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self._name} pool is shut down")
+            self._tasks.put(fn)
+            if self._idle == 0 and len(self._threads) < self._max_workers:
+                worker = threading.Thread(target=self._work, daemon=True,
+                                          name=f"{self._name}-{len(self._threads)}")
+                self._threads.append(worker)
+                worker.start()
+    
+    def shutdown(self):
+        """Stop accepting tasks; already queued tasks still run"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for _ in self._threads:
+                self._tasks.put(None)
+    
+    def _work(self):
+        while True:
+            with self._lock:
+                self._idle += 1
+            task = self._tasks.get()
+            with self._lock:
+                self._idle -= 1
+            if task is None:
+                return
+            try:
+                task()
+            except Exception as e:
+                logger.error(f"{self._name} task failed: {e}", exc_info=True)
+
 
 class GPIOActuatorController:
     """
@@ -67,12 +127,13 @@ class GPIOActuatorController:
         self.hardware_serial = hardware_serial or config.HARDWARE_SERIAL
         self.device_id = device_id or config.DEVICE_ID
         self.firestore_db = None
+        self._device_ref = None  # devices/{hardware_serial}, built once in connect()
         self._running = False
         self._config_manager = config_manager  # For dynamic intervals from Firestore
         
         # GPIO naming system
-        self._name_manager = GPIONameManager()
-        self._gpio_namer = GPIONamer()
+        self._name_manager = GPIONameManager(config.MODULE_KIND)
+        self._gpio_namer = self._name_manager.namer
         
         # Pin tracking
         self._pins_initialized: Dict[int, str] = {}       # bcmPin -> mode ('output'/'input')
@@ -99,6 +160,12 @@ class GPIOActuatorController:
         self._simulated_output: Dict[int, bool] = {}       # For simulation mode tracking
         self._simulated_pwm: Dict[int, float] = {}         # For simulation mode tracking
         
+        # Explicit command type -> handler (see _process_command)
+        self._command_handlers: Dict[str, Callable[..., None]] = {
+            'pin_control': self._handle_pin_control,
+            'pwm_control': self._handle_pwm_control,
+        }
+        
         # Schedule management (CRITICAL: real-time listening + cache + execution)
         self._schedule_cache: ScheduleCache = get_schedule_cache()
         self._schedule_state_tracker: ScheduleStateTracker = get_schedule_state_tracker()
@@ -110,8 +177,15 @@ class GPIOActuatorController:
         self._state_listener = None
         self._command_listener = None
         self._hardware_sync_thread: Optional[threading.Thread] = None
+        self._last_synced_snapshot: Optional[tuple] = None  # Last pin payload written by sync loop
+        self._external_gpio_writes = 0                     # Bumped by every other gpioState writer
+        self._snapshot_lock = threading.Lock()             # Guards the two fields above
+        self._pin_field_paths: Dict[int, tuple] = {}       # bcmPin -> sync loop field paths
         self._processed_commands: set = set()
         
+        # Shared workers for async Firestore writes and auto-off (built in connect())
+        self._worker_pool: Optional[_DaemonWorkerPool] = None
+        
         # Callbacks
         self._state_callbacks: Dict[int, Callable] = {}
         
@@ -123,16 +197,26 @@ class GPIOActuatorController:
         else:
             logger.info("⚠️  GPIO simulation mode (no hardware)")
     
-    def connect(self):
-        """Connect to Firestore and start real-time listeners"""
+    def connect(self, firestore_db=None):
+        """Connect to Firestore and start real-time listeners
+        
+        Args:
+            firestore_db: Existing Firestore client to share (defaults to firestore.client())
+        """
         try:
             if not firebase_admin._apps:
                 logger.error("Firebase not initialized")
                 return False
             
-            self.firestore_db = firestore.client()
+            self.firestore_db = firestore_db or firestore.client()
+            self._device_ref = self.firestore_db.collection('devices').document(self.hardware_serial)
             self._running = True
             
+            # Fresh workers on every connect - disconnect() shuts the old ones down
+            if self._worker_pool:
+                self._worker_pool.shutdown()
+            self._worker_pool = _DaemonWorkerPool(FIRESTORE_WRITE_WORKERS, "firestore-write")
+            
             # 1. Load pin definitions FROM Firestore (single source of truth)
             self._load_pins_from_firestore()
             
@@ -182,7 +266,7 @@ class GPIOActuatorController:
         No hardcoded pins — Firestore is the only authority.
         """
         try:
-            device_ref = self.firestore_db.collection('devices').document(self.hardware_serial)
+            device_ref = self._device_ref
             doc = device_ref.get()
             
             if not doc.exists:
@@ -232,17 +316,33 @@ class GPIOActuatorController:
             logger.info("No pins defined yet — add pins from the webapp and they'll be initialized automatically.")
             return
         
-        active_low = getattr(self, '_active_low_pins', set())
+        active_low = self._active_low_pins
         
         logger.info(f"🔧 Initializing {len(self._pin_names)} GPIO pins on hardware...")
         if active_low:
             logger.info(f"   Active-LOW relay pins: {sorted(active_low)}")
         
+        # RPi.GPIO.setup() accepts a list of channels: one call per initial
+        # level instead of one per pin. If a batch fails, the loop below
+        # retries those pins one by one so a single bad pin can't block the rest.
+        batched: set = set()
+        if GPIO_AVAILABLE and not config.SIMULATE_HARDWARE:
+            high_pins = sorted(pin for pin in self._pin_names if pin in active_low)
+            low_pins = sorted(pin for pin in self._pin_names if pin not in active_low)
+            for pins, initial in ((high_pins, GPIO.HIGH), (low_pins, GPIO.LOW)):
+                if not pins:
+                    continue
+                try:
+                    GPIO.setup(pins, GPIO.OUT, initial=initial)
+                    batched.update(pins)
+                except Exception as e:
+                    logger.debug("Batch setup of GPIO%s failed (%s), falling back to per-pin setup", pins, e)
+        
         for pin, name in sorted(self._pin_names.items()):
             try:
                 is_active_low = pin in active_low
                 
-                if GPIO_AVAILABLE and not config.SIMULATE_HARDWARE:
+                if GPIO_AVAILABLE and not config.SIMULATE_HARDWARE and pin not in batched:
                     if is_active_low:
                         # Active-LOW: initialize HIGH = relay OFF = device OFF
                         GPIO.setup(pin, GPIO.OUT, initial=GPIO.HIGH)
@@ -276,8 +376,6 @@ class GPIOActuatorController:
         logger.info(f"🔌 HOT-INIT: New pin GPIO{pin} ({name}) added from webapp")
         
         # Track active-LOW
-        if not hasattr(self, '_active_low_pins'):
-            self._active_low_pins = set()
         if active_low:
             self._active_low_pins.add(pin)
         else:
@@ -343,8 +441,7 @@ class GPIOActuatorController:
         self._hardware_states.pop(pin, None)
         self._last_firestore_state.pop(pin, None)
         self._simulated_output.pop(pin, None)
-        if hasattr(self, '_active_low_pins'):
-            self._active_low_pins.discard(pin)
+        self._active_low_pins.discard(pin)
         self._user_override_pins.discard(pin)
         
         logger.info(f"   ✓ GPIO{pin} ({name}): cleaned up")
@@ -363,7 +460,7 @@ class GPIOActuatorController:
         NEW pins: Create with sensible defaults.
         """
         try:
-            device_ref = self.firestore_db.collection('devices').document(self.hardware_serial)
+            device_ref = self._device_ref
             
             # Read current Firestore state
             doc = device_ref.get()
@@ -375,6 +472,7 @@ class GPIOActuatorController:
             pins_existing = 0
             pins_created = 0
             pins_cleared = 0
+            now_iso = datetime.now().isoformat()  # One timestamp for the whole boot batch
             
             for pin, legacy_name in self._pin_names.items():
                 pin_str = str(pin)
@@ -419,7 +517,8 @@ class GPIOActuatorController:
                     updated_pin_entry = self._name_manager.update_pin_with_smart_name(
                         gpio_number=pin,
                         existing_pin_data=None,
-                        device_type=device_type
+                        device_type=device_type,
+                        now_iso=now_iso
                     )
                     
                     updates[f'gpioState.{pin}.hardwareState'] = hw_state
@@ -469,13 +568,7 @@ class GPIOActuatorController:
     
     def _is_schedule_running_on_pin(self, pin: int) -> bool:
         """Check if ANY schedule is actively running on a GPIO pin."""
-        if not self._schedule_cache:
-            return False
-        schedules = self._schedule_cache.get_pin_schedules(pin)
-        for sched in schedules:
-            if self._schedule_state_tracker.is_running(pin, sched.schedule_id):
-                return True
-        return False
+        return self._schedule_state_tracker.is_pin_running(pin)
     
     # ──────────────────────────────────────────────────────────────────
     # REAL-TIME STATE LISTENER (Firestore → GPIO)
@@ -489,7 +582,7 @@ class GPIOActuatorController:
         this listener fires INSTANTLY and applies it to hardware.
         """
         try:
-            device_ref = self.firestore_db.collection('devices').document(self.hardware_serial)
+            device_ref = self._device_ref
             
             # Track if this is the initial snapshot (skip to avoid re-applying boot state)
             is_initial = [True]
@@ -656,12 +749,10 @@ class GPIOActuatorController:
     def _start_command_listener(self):
         """Listen for explicit commands in the commands subcollection"""
         try:
-            commands_ref = (self.firestore_db
-                           .collection('devices')
-                           .document(self.hardware_serial)
-                           .collection('commands'))
+            commands_ref = self._device_ref.collection('commands')
             
             def on_command_snapshot(doc_snapshot, changes, read_time):
+                processed_refs = []
                 for change in changes:
                     try:
                         if change.type.name != 'ADDED':
@@ -678,13 +769,12 @@ class GPIOActuatorController:
                         
                         if command_data:
                             self._process_command(command_id, command_data)
-                            # Delete command after processing
-                            try:
-                                change.document.reference.delete()
-                            except Exception:
-                                pass
+                            processed_refs.append(change.document.reference)
                     except Exception as e:
                         logger.error(f"Error processing command: {e}", exc_info=True)
+                
+                # Delete processed commands (one batch commit for a backlog)
+                self._delete_processed_commands(processed_refs)
             
             self._command_listener = commands_ref.on_snapshot(on_command_snapshot)
             logger.info(f"✓ Command listener ACTIVE on devices/{self.hardware_serial}/commands/")
@@ -692,6 +782,22 @@ class GPIOActuatorController:
         except Exception as e:
             logger.error(f"Failed to start command listener: {e}", exc_info=True)
     
+    def _delete_processed_commands(self, refs: List[Any]):
+        """Delete handled command docs: direct for one, a write batch for several."""
+        if not refs:
+            return
+        try:
+            if len(refs) == 1:
+                refs[0].delete()
+                return
+            for start in range(0, len(refs), FIRESTORE_BATCH_LIMIT):
+                batch = self.firestore_db.batch()
+                for ref in refs[start:start + FIRESTORE_BATCH_LIMIT]:
+                    batch.delete(ref)
+                batch.commit()
+        except Exception as e:
+            logger.debug("Could not delete processed commands: %s", e)
+    
     # ──────────────────────────────────────────────────────────────────
     # SCHEDULE LISTENER (real-time schedule execution)
     # ──────────────────────────────────────────────────────────────────
@@ -745,7 +851,7 @@ class GPIOActuatorController:
                                 if sched.is_active and sched.enabled:
                                     # If pin is manually overridden, respect user intent and DON'T re-trigger
                                     if gpio_num in self._user_override_pins:
-                                        logger.debug(f"⏳ GPIO{gpio_num} has active schedule but is user-overridden, skipping re-trigger")
+                                        logger.debug("⏳ GPIO%s has active schedule but is user-overridden, skipping re-trigger", gpio_num)
                                         continue
                                         
                                     if not self._schedule_state_tracker.is_running(gpio_num, sched.schedule_id):
@@ -813,10 +919,9 @@ class GPIOActuatorController:
             
             def is_in_time_window():
                 """Check if current time is within the schedule's time window"""
-                from datetime import datetime
-                now = datetime.now().strftime('%H:%M')
                 if not start_time or not end_time:
-                    return True  # No time restriction
+                    return True  # No time restriction - no need to read the clock
+                now = datetime.now().strftime('%H:%M')
                 if start_time <= end_time:
                     return start_time <= now <= end_time
                 else:
@@ -838,7 +943,7 @@ class GPIOActuatorController:
             with self._schedule_execution_lock:
                 # Don't start if already running
                 if self._schedule_state_tracker.is_running(pin, schedule_id):
-                    logger.debug(f"⏭️  Schedule {schedule_name} on GPIO{pin} already running, skipping")
+                    logger.debug("⏭️  Schedule %s on GPIO%s already running, skipping", schedule_name, pin)
                     return
                 self._schedule_state_tracker.mark_running(pin, schedule_id)
             
@@ -884,7 +989,7 @@ class GPIOActuatorController:
                         f'gpioState.{pin}.hardwareState': True,
                         f'gpioState.{pin}.lastHardwareRead': firestore.SERVER_TIMESTAMP,
                     })
-                logger.debug(f"   GPIO{pin}: ON (cycle {cycle_count}, {current_duration}s @ {current_pwm}%)")
+                logger.debug("   GPIO%s: ON (cycle %s, %ss @ %s%%)", pin, cycle_count, current_duration, current_pwm)
                 
                 # Sleep for duration (ON time), checking time window periodically
                 on_remaining = current_duration
@@ -898,13 +1003,13 @@ class GPIOActuatorController:
                     time.sleep(sleep_chunk)
                     on_remaining -= sleep_chunk
                 
-                if not is_in_time_window() or pin in self._user_override_pins:
+                if pin in self._user_override_pins or not is_in_time_window():
                     break
                 
                 # OFF phase
                 self._apply_to_hardware(pin, False)
                 self._desired_states[pin] = False
-                logger.debug(f"   GPIO{pin}: OFF (cycle {cycle_count}, {current_freq}s)")
+                logger.debug("   GPIO%s: OFF (cycle %s, %ss)", pin, cycle_count, current_freq)
                 
                 # Sleep for off time
                 off_remaining = max(0.5, current_freq)
@@ -981,86 +1086,100 @@ class GPIOActuatorController:
             logger.warning(f"Command {command_id} ({cmd_type}) missing 'pin' — data keys: {list(data.keys())}, payload keys: {list(payload.keys())}")
             return
             
-        if cmd_type == 'pin_control' and action in ('on', 'off'):
-            state = action == 'on'
-            
-            # Update state tracking (commands are explicit user actions)
-            self._desired_states[pin] = state
-            self._last_firestore_state[pin] = state
-            
-            # ANY manual pin_control command creates an override to stop conflicting schedules
-            if self._is_schedule_running_on_pin(pin):
-                self._user_override_pins.add(pin)
-                logger.info(f"🛑 Manual command: user override on GPIO{pin}, stopping schedules")
-            
-            # 1. Apply to hardware IMMEDIATELY
-            self._apply_to_hardware(pin, state)
-            self._hardware_states[pin] = state
-            
-            # 2. Update desired state AND hardwareState in Firestore (async)
-            # Writing hardwareState immediately gives instant UI feedback
-            self._async_firestore_write({
-                f'gpioState.{pin}.state': state,
-                f'gpioState.{pin}.hardwareState': state,
-                f'gpioState.{pin}.mismatch': False,
-                f'gpioState.{pin}.lastUpdated': firestore.SERVER_TIMESTAMP,
-                f'gpioState.{pin}.lastHardwareRead': firestore.SERVER_TIMESTAMP,
-            })
-            
-            # 3. Auto-off if duration specified
-            if duration and state:
-                def auto_off():
-                    time.sleep(duration)
-                    self._apply_to_hardware(pin, False)
-                    self._hardware_states[pin] = False
-                    self._async_firestore_write({
-                        f'gpioState.{pin}.state': False,
-                        f'gpioState.{pin}.hardwareState': False,
-                        f'gpioState.{pin}.mismatch': False,
-                        f'gpioState.{pin}.lastUpdated': firestore.SERVER_TIMESTAMP,
-                        f'gpioState.{pin}.lastHardwareRead': firestore.SERVER_TIMESTAMP,
-                    })
-                    logger.info(f"✓ GPIO{pin} auto-OFF after {duration}s")
-                threading.Thread(target=auto_off, daemon=True).start()
-            
-            logger.info(f"✓ GPIO{pin} → {action.upper()} (command: {command_id})")
-        
-        elif cmd_type == 'pwm_control':
-            # Extract duty_cycle from top-level or payload
-            duty_cycle = data.get('duty_cycle')
-            if duty_cycle is None:
-                duty_cycle = payload.get('duty_cycle')
-            if duty_cycle is None:
-                duty_cycle = 0
-            duty_cycle = float(duty_cycle)
-            
-            # Update internal duty cycle tracker
-            self._pwm_duty_cycles[pin] = duty_cycle
-            
-            # If user is manually adjusting PWM while schedule is running, override it
-            if self._is_schedule_running_on_pin(pin):
-                self._user_override_pins.add(pin)
-                logger.info(f"🛑 Manual PWM: user override on GPIO{pin}, stopping schedules")
-            
-            # If duty_cycle > 0, we assume intent is to be ON
-            # This ensures sync even if current state is OFF
-            is_on = duty_cycle > 0
-            self._desired_states[pin] = is_on
-            self._last_firestore_state[pin] = is_on
-            
-            self._apply_to_hardware(pin, is_on)
-            
-            # Update Firestore to confirm change and persistence
-            self._async_firestore_write({
-                f'gpioState.{pin}.state': is_on,
-                f'gpioState.{pin}.pwmDutyCycle': duty_cycle,
-                f'gpioState.{pin}.hardwareState': is_on,
-                f'gpioState.{pin}.lastUpdated': firestore.SERVER_TIMESTAMP,
-            })
-            
-            logger.info(f"✓ GPIO{pin} PWM → {duty_cycle}% (command: {command_id})")
-        else:
+        handler = self._command_handlers.get(cmd_type)
+        if handler is None:
             logger.warning(f"Unknown command type: {cmd_type}")
+            return
+        handler(command_id, pin, action, duration, data, payload)
+    
+    def _handle_pin_control(self, command_id: str, pin: int, action: str,
+                            duration: Any, data: Dict[str, Any], payload: Dict[str, Any]):
+        """pin_control command: switch a pin ON/OFF (optional auto-off duration)"""
+        if action not in ('on', 'off'):
+            logger.warning(f"Unknown command type: pin_control (action={action!r})")
+            return
+        
+        state = action == 'on'
+        
+        # Update state tracking (commands are explicit user actions)
+        self._desired_states[pin] = state
+        self._last_firestore_state[pin] = state
+        
+        # ANY manual pin_control command creates an override to stop conflicting schedules
+        if self._is_schedule_running_on_pin(pin):
+            self._user_override_pins.add(pin)
+            logger.info(f"🛑 Manual command: user override on GPIO{pin}, stopping schedules")
+        
+        # 1. Apply to hardware IMMEDIATELY
+        self._apply_to_hardware(pin, state)
+        self._hardware_states[pin] = state
+        
+        # 2. Update desired state AND hardwareState in Firestore (async)
+        # Writing hardwareState immediately gives instant UI feedback
+        self._async_firestore_write({
+            f'gpioState.{pin}.state': state,
+            f'gpioState.{pin}.hardwareState': state,
+            f'gpioState.{pin}.mismatch': False,
+            f'gpioState.{pin}.lastUpdated': firestore.SERVER_TIMESTAMP,
+            f'gpioState.{pin}.lastHardwareRead': firestore.SERVER_TIMESTAMP,
+        })
+        
+        # 3. Auto-off if duration specified
+        if duration and state:
+            def auto_off():
+                time.sleep(duration)
+                self._apply_to_hardware(pin, False)
+                self._hardware_states[pin] = False
+                self._async_firestore_write({
+                    f'gpioState.{pin}.state': False,
+                    f'gpioState.{pin}.hardwareState': False,
+                    f'gpioState.{pin}.mismatch': False,
+                    f'gpioState.{pin}.lastUpdated': firestore.SERVER_TIMESTAMP,
+                    f'gpioState.{pin}.lastHardwareRead': firestore.SERVER_TIMESTAMP,
+                })
+                logger.info(f"✓ GPIO{pin} auto-OFF after {duration}s")
+            # Own thread: it sleeps for the whole duration, and must fire even
+            # if the controller reconnects or disconnects in the meantime
+            threading.Thread(target=auto_off, daemon=True, name=f"gpio{pin}-auto-off").start()
+        
+        logger.info(f"✓ GPIO{pin} → {action.upper()} (command: {command_id})")
+    
+    def _handle_pwm_control(self, command_id: str, pin: int, action: str,
+                            duration: Any, data: Dict[str, Any], payload: Dict[str, Any]):
+        """pwm_control command: set a pin's PWM duty cycle"""
+        # Extract duty_cycle from top-level or payload
+        duty_cycle = data.get('duty_cycle')
+        if duty_cycle is None:
+            duty_cycle = payload.get('duty_cycle')
+        if duty_cycle is None:
+            duty_cycle = 0
+        duty_cycle = float(duty_cycle)
+        
+        # Update internal duty cycle tracker
+        self._pwm_duty_cycles[pin] = duty_cycle
+        
+        # If user is manually adjusting PWM while schedule is running, override it
+        if self._is_schedule_running_on_pin(pin):
+            self._user_override_pins.add(pin)
+            logger.info(f"🛑 Manual PWM: user override on GPIO{pin}, stopping schedules")
+        
+        # If duty_cycle > 0, we assume intent is to be ON
+        # This ensures sync even if current state is OFF
+        is_on = duty_cycle > 0
+        self._desired_states[pin] = is_on
+        self._last_firestore_state[pin] = is_on
+        
+        self._apply_to_hardware(pin, is_on)
+        
+        # Update Firestore to confirm change and persistence
+        self._async_firestore_write({
+            f'gpioState.{pin}.state': is_on,
+            f'gpioState.{pin}.pwmDutyCycle': duty_cycle,
+            f'gpioState.{pin}.hardwareState': is_on,
+            f'gpioState.{pin}.lastUpdated': firestore.SERVER_TIMESTAMP,
+        })
+        
+        logger.info(f"✓ GPIO{pin} PWM → {duty_cycle}% (command: {command_id})")
     
     # ──────────────────────────────────────────────────────────────────
     # HARDWARE CONTROL (GPIO reads/writes)
@@ -1080,7 +1199,7 @@ class GPIOActuatorController:
         if bcm_pin not in self._pins_initialized:
             self._setup_pin(bcm_pin, 'output')
         
-        active_low = getattr(self, '_active_low_pins', set())
+        active_low = self._active_low_pins
         is_active_low = bcm_pin in active_low
         
         # Check if we should use PWM
@@ -1205,7 +1324,7 @@ class GPIOActuatorController:
             # GPIO.input() works on output pins too on RPi - returns current output level
             val = GPIO.input(bcm_pin)
             
-            active_low = getattr(self, '_active_low_pins', set())
+            active_low = self._active_low_pins
             if bcm_pin in active_low:
                 # Active-LOW: GPIO LOW = relay ON = True
                 return val == GPIO.LOW
@@ -1221,7 +1340,7 @@ class GPIOActuatorController:
         try:
 
 
-            active_low = getattr(self, '_active_low_pins', set())
+            active_low = self._active_low_pins
             
             if GPIO_AVAILABLE and not config.SIMULATE_HARDWARE:
                 if mode == 'output':
@@ -1249,6 +1368,23 @@ class GPIOActuatorController:
             return self._config_manager.get_hardware_state_sync_interval()
         return 30.0
     
+    def _sync_field_paths(self, pin: int) -> tuple:
+        """Firestore field paths written for a pin by the sync loop, built once per pin.
+        
+        Returns (hardwareState, mismatch, lastHardwareRead, pwmDutyCycle) paths.
+        """
+        paths = self._pin_field_paths.get(pin)
+        if paths is None:
+            prefix = f'gpioState.{pin}.'
+            paths = (
+                prefix + 'hardwareState',
+                prefix + 'mismatch',
+                prefix + 'lastHardwareRead',
+                prefix + 'pwmDutyCycle',
+            )
+            self._pin_field_paths[pin] = paths
+        return paths
+    
     def _start_hardware_sync_loop(self):
         """Start background thread with TWO separate cadences:
         
@@ -1303,9 +1439,9 @@ class GPIOActuatorController:
                                     f'gpioState.{pin}.lastHardwareRead': firestore.SERVER_TIMESTAMP,
                                 })
                             else:
-                                logger.debug(f"⏳ GPIO{pin}: mismatch (desired={desired}, hw={actual}) expected — schedule active")
+                                logger.debug("⏳ GPIO%s: mismatch (desired=%s, hw=%s) expected — schedule active", pin, desired, actual)
                     else:
-                        logger.debug(f"🔄 Local read: {len(self._pins_initialized)} pins OK")
+                        logger.debug("🔄 Local read: %d pins OK", len(self._pins_initialized))
                     
                     # ── FIRESTORE WRITE (at configured interval) ──────
                     # Re-read interval each cycle so config changes take effect live
@@ -1316,6 +1452,8 @@ class GPIOActuatorController:
                         last_firestore_write = now
                         
                         updates = {}
+                        read_updates = {}
+                        snapshot = []
                         for pin in self._pins_initialized:
                             hw_state = self._hardware_states.get(pin)
                             if hw_state is None:
@@ -1324,22 +1462,45 @@ class GPIOActuatorController:
                             # If a schedule is actively controlling this pin, there's no mismatch
                             is_schedule_controlled = self._is_schedule_running_on_pin(pin)
                             mismatch = (desired != hw_state) and not is_schedule_controlled
-                            updates[f'gpioState.{pin}.hardwareState'] = hw_state
-                            updates[f'gpioState.{pin}.mismatch'] = mismatch
-                            updates[f'gpioState.{pin}.lastHardwareRead'] = firestore.SERVER_TIMESTAMP
+                            pwm_duty = self._pwm_duty_cycles.get(pin)
+                            snapshot.append((pin, hw_state, mismatch, pwm_duty))
+                            hw_path, mismatch_path, read_path, pwm_path = self._sync_field_paths(pin)
+                            updates[hw_path] = hw_state
+                            updates[mismatch_path] = mismatch
+                            updates[read_path] = firestore.SERVER_TIMESTAMP
+                            read_updates[read_path] = firestore.SERVER_TIMESTAMP
                             
                             # Include PWM duty cycle if this pin has PWM active
-                            if pin in self._pwm_duty_cycles:
-                                updates[f'gpioState.{pin}.pwmDutyCycle'] = self._pwm_duty_cycles[pin]
+                            if pwm_duty is not None:
+                                updates[pwm_path] = pwm_duty
                         
                         if updates:
+                            # Skip re-sending pin fields Firestore already has — only
+                            # lastHardwareRead and the heartbeat go out when nothing changed
+                            snapshot = tuple(sorted(snapshot))
+                            with self._snapshot_lock:
+                                unchanged = snapshot == self._last_synced_snapshot
+                                writes_before = self._external_gpio_writes
+                            if unchanged:
+                                updates = read_updates
+                            
                             # Include heartbeat in the same write — saves a separate Firestore call
                             updates['lastHeartbeat'] = firestore.SERVER_TIMESTAMP
                             updates['status'] = 'online'
                             try:
-                                device_ref = self.firestore_db.collection('devices').document(self.hardware_serial)
+                                device_ref = self._device_ref
                                 device_ref.update(updates)
-                                logger.info(f"📤 Firestore sync + heartbeat: {len(self._pins_initialized)} pins written (next in {sync_interval}s)")
+                                # Only trust the snapshot if no other writer touched
+                                # gpioState while this update was in flight
+                                with self._snapshot_lock:
+                                    if self._external_gpio_writes == writes_before:
+                                        self._last_synced_snapshot = snapshot
+                                    else:
+                                        self._last_synced_snapshot = None
+                                if unchanged:
+                                    logger.debug("💓 Heartbeat + read times only — hardware state unchanged (next in %ss)", sync_interval)
+                                else:
+                                    logger.info(f"📤 Firestore sync + heartbeat: {len(self._pins_initialized)} pins written (next in {sync_interval}s)")
                             except Exception as e:
                                 logger.error(f"Hardware sync Firestore write failed: {e}")
                 
@@ -1355,16 +1516,36 @@ class GPIOActuatorController:
     # ASYNC FIRESTORE HELPERS (non-blocking writes)
     # ──────────────────────────────────────────────────────────────────
     
+    def _invalidate_synced_snapshot(self):
+        """Force the sync loop's next pass to rewrite every pin's fields."""
+        with self._snapshot_lock:
+            self._external_gpio_writes += 1
+            self._last_synced_snapshot = None
+    
     def _async_firestore_write(self, updates: Dict[str, Any]):
-        """Write to Firestore in background thread. NEVER blocks GPIO operations."""
+        """Write to Firestore in background thread. NEVER blocks GPIO operations.
+        
+        Every caller writes gpioState fields the sync loop also writes, so its
+        record of what Firestore holds is dropped (before and after the write
+        lands) and its next pass writes every pin again.
+        """
         def _write():
             try:
-                device_ref = self.firestore_db.collection('devices').document(self.hardware_serial)
+                device_ref = self._device_ref
                 device_ref.update(updates)
             except Exception as e:
                 logger.error(f"Async Firestore write failed: {e}")
+            finally:
+                self._invalidate_synced_snapshot()
         
-        threading.Thread(target=_write, daemon=True).start()
+        self._invalidate_synced_snapshot()
+        pool = self._worker_pool
+        try:
+            if pool is None:
+                raise RuntimeError("not connected")
+            pool.submit(_write)
+        except RuntimeError as e:
+            logger.warning(f"⚠️  Firestore write dropped: {e}")
     
     # ──────────────────────────────────────────────────────────────────
     # PUBLIC API
@@ -1383,7 +1564,7 @@ class GPIOActuatorController:
         """
         logger.critical("🚨 EMERGENCY STOP — forcing ALL pins OFF")
         
-        active_low = getattr(self, '_active_low_pins', set())
+        active_low = self._active_low_pins
         updates = {}
         
         for pin in list(self._pins_initialized.keys()):
@@ -1420,8 +1601,9 @@ class GPIOActuatorController:
             updates['lastHeartbeat'] = firestore.SERVER_TIMESTAMP
             updates['status'] = 'online'
             updates['lastEmergencyStop'] = firestore.SERVER_TIMESTAMP
-            device_ref = self.firestore_db.collection('devices').document(self.hardware_serial)
+            device_ref = self._device_ref
             device_ref.update(updates)
+            self._invalidate_synced_snapshot()  # Pin fields changed outside the sync loop
             logger.critical(f"🚨 EMERGENCY STOP COMPLETE — {len(self._pins_initialized)} pins forced OFF, Firestore updated")
         except Exception as e:
             logger.error(f"🚨 Emergency stop Firestore write failed: {e}")
@@ -1479,7 +1661,7 @@ class GPIOActuatorController:
                 logger.warning(f"Rename GPIO{gpio_number}: Name cannot be empty")
                 return False
             
-            device_ref = self.firestore_db.collection('devices').document(self.hardware_serial)
+            device_ref = self._device_ref
             
             # Get current pin data
             doc = device_ref.get()
@@ -1488,15 +1670,21 @@ class GPIOActuatorController:
                 return False
             
             existing_gpio = doc.to_dict().get('gpioState', {})
-            existing_pin = existing_gpio.get(str(gpio_number), {})
+            existing_pin = existing_gpio.get(str(gpio_number)) or {}
             
             # Use name manager to safely rename
             updated_entry = self._name_manager.rename_gpio_pin(
                 gpio_number=gpio_number,
                 new_name=new_name,
-                existing_pin_data=existing_pin or {}
+                existing_pin_data=existing_pin
             )
             
+            if updated_entry is existing_pin:
+                # Same custom name already stored - skip the no-op write
+                self._pin_names[gpio_number] = updated_entry['name']
+                logger.info(f"✓ GPIO{gpio_number} already named '{updated_entry['name']}'")
+                return True
+            
             # Update Firestore
             updates = {
                 f'gpioState.{gpio_number}.name': updated_entry['name'],
@@ -1531,7 +1719,7 @@ class GPIOActuatorController:
             True if successful, False otherwise
         """
         try:
-            device_ref = self.firestore_db.collection('devices').document(self.hardware_serial)
+            device_ref = self._device_ref
             
             # Get current pin data
             doc = device_ref.get()
@@ -1552,6 +1740,12 @@ class GPIOActuatorController:
                 existing_pin_data=existing_pin
             )
             
+            if updated_entry is existing_pin:
+                # Already on the smart default - skip the no-op write
+                self._pin_names[gpio_number] = updated_entry['name']
+                logger.info(f"✓ GPIO{gpio_number} name already at smart default")
+                return True
+            
             # Update Firestore
             updates = {
                 f'gpioState.{gpio_number}.name': updated_entry['name'],
@@ -1583,7 +1777,7 @@ class GPIOActuatorController:
             Dictionary with pin info or None if not found
         """
         try:
-            device_ref = self.firestore_db.collection('devices').document(self.hardware_serial)
+            device_ref = self._device_ref
             doc = device_ref.get()
             
             if not doc.exists:
@@ -1637,6 +1831,10 @@ class GPIOActuatorController:
             self._schedule_checker_thread.join(timeout=5)
             logger.info("  Schedule checker thread stopped")
         
+        # Queued writes still go out; new ones are dropped until the next connect()
+        if self._worker_pool:
+            self._worker_pool.shutdown()
+        
         if GPIO_AVAILABLE and not config.SIMULATE_HARDWARE:
             # Stop all PWM objects
             for pin, pwm_obj in self._pwm_objects.items():
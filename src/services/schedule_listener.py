@@ -38,16 +38,19 @@ CACHE SYNC CRITICAL:
 import logging
 import threading
 import time
-from typing import Dict, Optional, List, Any
+from functools import lru_cache
+from typing import Dict, Optional, List, Any, Set, Tuple
 from datetime import datetime, time as datetime_time
 from dataclasses import dataclass, field
 import firebase_admin
 from firebase_admin import firestore
 
+from ..utils.compat import DATACLASS_SLOTS
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ScheduleDefinition:
     """In-memory representation of a schedule"""
     schedule_id: str
@@ -77,7 +80,11 @@ class TimeWindowValidator:
     """Validates if current time is within schedule's time window (if specified)"""
     
     @staticmethod
-    def is_in_window(start_time: Optional[str], end_time: Optional[str]) -> bool:
+    def is_in_window(
+        start_time: Optional[str],
+        end_time: Optional[str],
+        now: Optional[datetime_time] = None
+    ) -> bool:
         """
         Check if current time is within the time window.
         
@@ -87,6 +94,8 @@ class TimeWindowValidator:
         Args:
             start_time: "HH:MM" format or None (no start limit)
             end_time: "HH:MM" format or None (no end limit)
+            now: Time of day to check (defaults to current time; pass one
+                value when checking many schedules)
             
         Returns:
             True if current time is within window, False otherwise
@@ -95,21 +104,11 @@ class TimeWindowValidator:
         if not start_time and not end_time:
             return True
         
-        now = datetime.now().time()
+        if now is None:
+            now = datetime.now().time()
         
         try:
-            # Parse times
-            if start_time:
-                start_parts = start_time.split(":")
-                start = datetime_time(int(start_parts[0]), int(start_parts[1]))
-            else:
-                start = datetime_time(0, 0)  # Midnight
-            
-            if end_time:
-                end_parts = end_time.split(":")
-                end = datetime_time(int(end_parts[0]), int(end_parts[1]))
-            else:
-                end = datetime_time(23, 59)  # 23:59
+            start, end = _parse_window(start_time, end_time)
             
             # Check if within window
             if start <= end:
@@ -124,13 +123,40 @@ class TimeWindowValidator:
             return False
     
     @staticmethod
-    def should_skip_due_to_window(start_time: Optional[str], end_time: Optional[str]) -> bool:
+    def should_skip_due_to_window(
+        start_time: Optional[str],
+        end_time: Optional[str],
+        now: Optional[datetime_time] = None
+    ) -> bool:
         """
         Check if schedule should be SKIPPED due to time window constraint.
         
         Returns True if schedule would be outside window.
         """
-        return not TimeWindowValidator.is_in_window(start_time, end_time)
+        return not TimeWindowValidator.is_in_window(start_time, end_time, now)
+
+
+@lru_cache(maxsize=128)
+def _parse_window(start_time: Optional[str], end_time: Optional[str]) -> Tuple[datetime_time, datetime_time]:
+    """Parse "HH:MM" window bounds into time objects.
+    
+    Window strings only change when a schedule is edited, so the parsed
+    pair is cached instead of re-split on every check. Raises ValueError
+    or IndexError on malformed input (errors are not cached).
+    """
+    if start_time:
+        start_parts = start_time.split(":")
+        start = datetime_time(int(start_parts[0]), int(start_parts[1]))
+    else:
+        start = datetime_time(0, 0)  # Midnight
+    
+    if end_time:
+        end_parts = end_time.split(":")
+        end = datetime_time(int(end_parts[0]), int(end_parts[1]))
+    else:
+        end = datetime_time(23, 59)  # 23:59
+    
+    return start, end
 
 
 class ScheduleCache:
@@ -207,6 +233,11 @@ class ScheduleCache:
         with self._lock:
             return list(self._cache.get(gpio_number, {}).values())
     
+    def get_pin_schedule_map(self, gpio_number: int) -> Dict[str, ScheduleDefinition]:
+        """Get a pin's schedules keyed by schedule_id (snapshot copy)"""
+        with self._lock:
+            return dict(self._cache.get(gpio_number, {}))
+    
     def get_active_schedules(self, gpio_number: int) -> List[ScheduleDefinition]:
         """Get only active schedules for a GPIO pin (time window respected)"""
         with self._lock:
@@ -222,11 +253,12 @@ class ScheduleCache:
         """
         with self._lock:
             changed_count = 0
+            now = datetime.now().time()  # One clock read for the whole pass
             for gpio_num, schedules in self._cache.items():
                 for schedule_id, sched in schedules.items():
                     if sched.enabled:
                         was_active = sched.is_active
-                        should_skip = TimeWindowValidator.should_skip_due_to_window(sched.start_time, sched.end_time)
+                        should_skip = TimeWindowValidator.should_skip_due_to_window(sched.start_time, sched.end_time, now)
                         is_now_active = not should_skip
                         
                         if is_now_active != was_active:
@@ -256,6 +288,7 @@ class ScheduleStateTracker:
     def __init__(self):
         self._lock = threading.RLock()
         self._running_schedules: Dict[str, datetime] = {}  # {pin-schedule_id: start_time}
+        self._running_by_pin: Dict[int, Set[str]] = {}  # {pin: {schedule_id}} index for per-pin checks
         self._last_interval_run: Dict[str, datetime] = {}  # Track interval-based last runs
     
     def mark_running(self, gpio_number: int, schedule_id: str) -> None:
@@ -263,14 +296,20 @@ class ScheduleStateTracker:
         with self._lock:
             key = f"{gpio_number}-{schedule_id}"
             self._running_schedules[key] = datetime.now()
-            logger.debug(f"▶️  Schedule {key} marked as running")
+            self._running_by_pin.setdefault(gpio_number, set()).add(schedule_id)
+            logger.debug("▶️  Schedule %s marked as running", key)
     
     def mark_stopped(self, gpio_number: int, schedule_id: str) -> None:
         """Mark schedule as stopped"""
         with self._lock:
             key = f"{gpio_number}-{schedule_id}"
             self._running_schedules.pop(key, None)
-            logger.debug(f"⏹️  Schedule {key} marked as stopped")
+            running = self._running_by_pin.get(gpio_number)
+            if running is not None:
+                running.discard(schedule_id)
+                if not running:
+                    del self._running_by_pin[gpio_number]
+            logger.debug("⏹️  Schedule %s marked as stopped", key)
     
     def is_running(self, gpio_number: int, schedule_id: str) -> bool:
         """Check if schedule is currently running"""
@@ -278,6 +317,11 @@ class ScheduleStateTracker:
             key = f"{gpio_number}-{schedule_id}"
             return key in self._running_schedules
     
+    def is_pin_running(self, gpio_number: int) -> bool:
+        """Check if any schedule is currently running on a pin"""
+        with self._lock:
+            return gpio_number in self._running_by_pin
+    
     def update_last_run(self, gpio_number: int, schedule_id: str, last_run: datetime) -> None:
         """Update last run time for interval-based schedules"""
         with self._lock:
@@ -3,12 +3,15 @@ Local SQLite database operations for HarvestPilot device.
 Handles all local data persistence with 30-day rolling storage.
 """
 
+import json
 import sqlite3
-import time
 from pathlib import Path
 from typing import Optional
 from contextlib import contextmanager
 
+from pydantic import TypeAdapter
+
+from ..utils.clock import now_ms
 from .models import (
     SensorReading,
     HourlySummary,
@@ -17,8 +20,32 @@ from .models import (
     DeviceEvent,
     CropConfig,
     CommandStatus,
+    CommandType,
+    AlertType,
+    AlertSeverity,
+    EventType,
 )
 
+# Validates a whole batch of command rows in one call instead of one
+# Command(...) construction per row
+_COMMAND_LIST_ADAPTER = TypeAdapter(list[Command])
+
+# Stored enum values -> members, so rows hand pydantic the enum directly
+_COMMAND_TYPES = {m.value: m for m in CommandType}
+_COMMAND_STATUSES = {m.value: m for m in CommandStatus}
+_ALERT_TYPES = {m.value: m for m in AlertType}
+_ALERT_SEVERITIES = {m.value: m for m in AlertSeverity}
+_EVENT_TYPES = {m.value: m for m in EventType}
+
+# Updatable schedule_state columns -> their prebuilt "col = ?" SET fragment
+_SCHEDULE_STATE_SET_FRAGMENTS = {
+    col: f"{col} = ?"
+    for col in (
+        'autopilot_mode', 'last_irrigation_at', 'next_irrigation_at',
+        'failsafe_triggered', 'failsafe_reason',
+    )
+}
+
 
 class LocalDatabase:
     """SQLite database manager for local device storage."""
@@ -225,7 +252,7 @@ class LocalDatabase:
                     lightOn=bool(row['light_on']),
                     pumpOn=bool(row['pump_on']),
                 )
-                for row in cursor.fetchall()
+                for row in cursor
             ]
 
     def get_latest_reading(self) -> Optional[SensorReading]:
@@ -254,7 +281,7 @@ class LocalDatabase:
 
     def cleanup_old_readings(self, days: int = 30) -> int:
         """Delete readings older than specified days. Returns count deleted."""
-        cutoff = int(time.time() * 1000) - (days * 24 * 60 * 60 * 1000)
+        cutoff = now_ms() - (days * 24 * 60 * 60 * 1000)
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM sensor_readings WHERE timestamp < ?", (cutoff,))
@@ -358,7 +385,7 @@ class LocalDatabase:
                     pumpOnMinutes=row['pump_on_minutes'],
                     readingCount=row['reading_count'],
                 )
-                for row in cursor.fetchall()
+                for row in cursor
             ]
 
     def mark_summaries_synced(self, hours: list[int]) -> None:
@@ -380,7 +407,6 @@ class LocalDatabase:
 
     def insert_alert(self, alert: Alert) -> None:
         """Insert a new alert."""
-        import json
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -399,12 +425,11 @@ class LocalDatabase:
                 alert.triggered_at,
                 alert.acknowledged_at,
                 alert.resolved_at,
-                json.dumps(alert.reading_snapshot.model_dump()) if alert.reading_snapshot else None,
+                alert.reading_snapshot.model_dump_json() if alert.reading_snapshot else None,
             ))
 
     def get_active_alerts(self) -> list[Alert]:
         """Get all unresolved alerts."""
-        import json
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -414,15 +439,15 @@ class LocalDatabase:
             """)
             
             alerts = []
-            for row in cursor.fetchall():
+            for row in cursor:
                 snapshot = None
                 if row['reading_snapshot']:
-                    snapshot = SensorReading(**json.loads(row['reading_snapshot']))
+                    snapshot = SensorReading.model_validate_json(row['reading_snapshot'])
                 
                 alerts.append(Alert(
                     id=row['id'],
-                    type=row['type'],
-                    severity=row['severity'],
+                    type=_ALERT_TYPES[row['type']],
+                    severity=_ALERT_SEVERITIES[row['severity']],
                     title=row['title'],
                     message=row['message'],
                     explanation=row['explanation'],
@@ -450,7 +475,6 @@ class LocalDatabase:
 
     def insert_command(self, command: Command) -> None:
         """Insert a new command from cloud."""
-        import json
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -469,7 +493,6 @@ class LocalDatabase:
 
     def get_pending_commands(self) -> list[Command]:
         """Get all pending commands."""
-        import json
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -478,18 +501,18 @@ class LocalDatabase:
                 ORDER BY issued_at ASC
             """)
             
-            return [
-                Command(
-                    id=row['id'],
-                    type=row['type'],
-                    payload=json.loads(row['payload']) if row['payload'] else {},
-                    issuedAt=row['issued_at'],
-                    status=row['status'],
-                    executedAt=row['executed_at'],
-                    errorMessage=row['error_message'],
-                )
-                for row in cursor.fetchall()
-            ]
+            return _COMMAND_LIST_ADAPTER.validate_python([
+                {
+                    'id': row['id'],
+                    'type': _COMMAND_TYPES[row['type']],
+                    'payload': json.loads(row['payload']) if row['payload'] else {},
+                    'issuedAt': row['issued_at'],
+                    'status': _COMMAND_STATUSES[row['status']],
+                    'executedAt': row['executed_at'],
+                    'errorMessage': row['error_message'],
+                }
+                for row in cursor
+            ])
 
     def update_command_status(
         self,
@@ -513,7 +536,6 @@ class LocalDatabase:
 
     def insert_event(self, event: DeviceEvent) -> None:
         """Insert a new event."""
-        import json
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -528,7 +550,6 @@ class LocalDatabase:
 
     def get_unsynced_events(self) -> list[DeviceEvent]:
         """Get all events that haven't been synced."""
-        import json
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -540,11 +561,11 @@ class LocalDatabase:
             return [
                 DeviceEvent(
                     id=row['id'],
-                    type=row['type'],
+                    type=_EVENT_TYPES[row['type']],
                     timestamp=row['timestamp'],
                     data=json.loads(row['data']) if row['data'] else None,
                 )
-                for row in cursor.fetchall()
+                for row in cursor
             ]
 
     def mark_events_synced(self, event_ids: list[str]) -> None:
@@ -645,16 +666,11 @@ class LocalDatabase:
         if not kwargs:
             return
         
-        valid_fields = {
-            'autopilot_mode', 'last_irrigation_at', 'next_irrigation_at',
-            'failsafe_triggered', 'failsafe_reason'
-        }
-        
-        fields = {k: v for k, v in kwargs.items() if k in valid_fields}
+        fields = {k: v for k, v in kwargs.items() if k in _SCHEDULE_STATE_SET_FRAGMENTS}
         if not fields:
             return
         
-        set_clause = ', '.join([f"{k} = ?" for k in fields.keys()])
+        set_clause = ', '.join(map(_SCHEDULE_STATE_SET_FRAGMENTS.__getitem__, fields))
         values = list(fields.values())
         
         with self._get_connection() as conn:
@@ -3,7 +3,7 @@ Pydantic models derived from contracts/schema.ts
 This file is the Python equivalent of the canonical TypeScript schema.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Literal, Optional
 from enum import Enum
 
@@ -101,17 +101,18 @@ class EventType(str, Enum):
 # =============================================================================
 
 class DeviceIdentity(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+
     device_id: str = Field(alias="deviceId")
     firmware_version: str = Field(alias="firmwareVersion")
     hardware_revision: str = Field(alias="hardwareRevision")
     mac_address: str = Field(alias="macAddress")
     registered_at: int = Field(alias="registeredAt")
 
-    class Config:
-        populate_by_name = True
-
 
 class SensorReading(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+
     timestamp: int
     temperature: float  # Fahrenheit
     humidity: float  # Percent (0-100)
@@ -120,11 +121,10 @@ class SensorReading(BaseModel):
     light_on: bool = Field(alias="lightOn")
     pump_on: bool = Field(alias="pumpOn")
 
-    class Config:
-        populate_by_name = True
-
 
 class HourlySummary(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+
     hour: int  # Unix timestamp (ms) - start of hour
     temp_min: float = Field(alias="tempMin")
     temp_max: float = Field(alias="tempMax")
@@ -138,11 +138,10 @@ class HourlySummary(BaseModel):
     pump_on_minutes: int = Field(alias="pumpOnMinutes")
     reading_count: int = Field(alias="readingCount")
 
-    class Config:
-        populate_by_name = True
-
 
 class CropConfig(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+
     crop_type: CropType = Field(alias="cropType")
     planted_at: int = Field(alias="plantedAt")
     expected_harvest_days: int = Field(alias="expectedHarvestDays")
@@ -155,11 +154,10 @@ class CropConfig(BaseModel):
     humidity_target_min: float = Field(alias="humidityTargetMin")
     humidity_target_max: float = Field(alias="humidityTargetMax")
 
-    class Config:
-        populate_by_name = True
-
 
 class Alert(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+
     id: str
     type: AlertType
     severity: AlertSeverity
@@ -172,11 +170,10 @@ class Alert(BaseModel):
     resolved_at: Optional[int] = Field(default=None, alias="resolvedAt")
     reading_snapshot: Optional[SensorReading] = Field(default=None, alias="readingSnapshot")
 
-    class Config:
-        populate_by_name = True
-
 
 class Command(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+
     id: str
     type: CommandType
     payload: dict = Field(default_factory=dict)
@@ -185,22 +182,20 @@ class Command(BaseModel):
     executed_at: Optional[int] = Field(default=None, alias="executedAt")
     error_message: Optional[str] = Field(default=None, alias="errorMessage")
 
-    class Config:
-        populate_by_name = True
-
 
 class DeviceEvent(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+
     id: str
     type: EventType
     timestamp: int
     data: Optional[dict] = None
 
-    class Config:
-        populate_by_name = True
-
 
 class DeviceState(BaseModel):
     """Full device state document for Firestore"""
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+
     device_id: str = Field(alias="deviceId")
     owner_id: str = Field(alias="ownerId")
     status: DeviceStatus
@@ -216,9 +211,6 @@ class DeviceState(BaseModel):
     last_irrigation_at: Optional[int] = Field(default=None, alias="lastIrrigationAt")
     next_irrigation_at: Optional[int] = Field(default=None, alias="nextIrrigationAt")
 
-    class Config:
-        populate_by_name = True
-
 
 # =============================================================================
 # CROP PRESETS
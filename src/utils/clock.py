@@ -0,0 +1,8 @@
+"""Time helpers"""
+
+import time
+
+
+def now_ms() -> int:
+    """Current Unix time in integer milliseconds (no float round-trip)"""
+    return time.time_ns() // 1_000_000
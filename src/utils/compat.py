@@ -0,0 +1,6 @@
+"""Python version compatibility helpers"""
+
+import sys
+
+# dataclass(slots=True) needs Python 3.10+; older interpreters get plain classes
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
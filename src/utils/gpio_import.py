@@ -1,115 +1,95 @@
 """Conditional GPIO import handler for cross-platform compatibility"""
 
+import importlib.util
 import logging
 from .. import config
 
 logger = logging.getLogger(__name__)
 
-# Try to import RPi.GPIO, fall back to mock if not available
-try:
-    import RPi.GPIO as GPIO
-    GPIO_AVAILABLE = True
-    logger.debug("✅ RPi.GPIO imported successfully")
-except ImportError:
-    GPIO_AVAILABLE = False
-    logger.warning("⚠️  RPi.GPIO not available - using simulation mode")
-    
-    # Create mock GPIO module for testing
-    class MockGPIO:
-        """Mock GPIO for testing on non-Pi systems"""
-        BCM = "BCM"
-        OUT = "OUT"
-        IN = "IN"
-        HIGH = 1
-        LOW = 0
-        
-        @staticmethod
-        def setmode(mode):
-            logger.debug(f"[MOCK GPIO] setmode({mode})")
-        
-        @staticmethod
-        def setup(pin, mode):
-            logger.debug(f"[MOCK GPIO] setup(pin={pin}, mode={mode})")
-        
-        @staticmethod
-        def output(pin, state):
-            state_str = "HIGH" if state == 1 else "LOW"
-            logger.info(f"[MOCK GPIO] output(pin={pin}, state={state_str})")
-        
-        @staticmethod
-        def input(pin):
-            logger.debug(f"[MOCK GPIO] input(pin={pin})")
-            return 0
-        
-        @staticmethod
-        def cleanup():
-            logger.debug(f"[MOCK GPIO] cleanup()")
-        
-        class PWM:
-            def __init__(self, pin, frequency):
-                self.pin = pin
-                self.frequency = frequency
-                logger.info(f"[MOCK GPIO] PWM(pin={pin}, frequency={frequency})")
-            
-            def start(self, duty_cycle):
-                logger.info(f"[MOCK GPIO] PWM.start(pin={self.pin}, duty_cycle={duty_cycle}%)")
-            
-            def ChangeDutyCycle(self, duty_cycle):
-                logger.info(f"[MOCK GPIO] PWM.ChangeDutyCycle(pin={self.pin}, duty_cycle={duty_cycle}%)")
-            
-            def stop(self):
-                logger.info(f"[MOCK GPIO] PWM.stop(pin={self.pin})")
-    
-    GPIO = MockGPIO()
+
+class _FakePWM:
+    """PWM channel for _FakeGPIO (prefix/emojis are bound per GPIO instance)"""
+    _prefix = "FAKE GPIO"
+    _emojis: dict = {}
+
+    def __init__(self, pin, frequency):
+        self.pin = pin
+        self.frequency = frequency
+        logger.info("[%s] %sPWM(pin=%s, frequency=%sHz)",
+                    self._prefix, self._emojis.get("pwm", ""), pin, frequency)
+
+    def start(self, duty_cycle):
+        logger.info("[%s] %sPWM.start(pin=%s, duty_cycle=%s%%)",
+                    self._prefix, self._emojis.get("pwm_start", ""), self.pin, duty_cycle)
+
+    def ChangeDutyCycle(self, duty_cycle):
+        logger.info("[%s] %sPWM.ChangeDutyCycle(pin=%s, duty_cycle=%s%%)",
+                    self._prefix, self._emojis.get("pwm_duty", ""), self.pin, duty_cycle)
+
+    def stop(self):
+        logger.info("[%s] %sPWM.stop(pin=%s)",
+                    self._prefix, self._emojis.get("pwm_stop", ""), self.pin)
+
+
+class _FakeGPIO:
+    """Stand-in for RPi.GPIO that only logs (non-Pi systems and simulation mode)"""
+    BCM = "BCM"
+    OUT = "OUT"
+    IN = "IN"
+    HIGH = 1
+    LOW = 0
+
+    def __init__(self, prefix: str, emojis: dict = None, setup_level: int = logging.DEBUG):
+        self._prefix = prefix
+        self._emojis = emojis or {}
+        self._setup_level = setup_level
+        self.PWM = type("PWM", (_FakePWM,), {"_prefix": prefix, "_emojis": self._emojis})
+
+    def setmode(self, mode):
+        logger.debug("[%s] setmode(%s)", self._prefix, mode)
+
+    def setup(self, pin, mode):
+        logger.log(self._setup_level, "[%s] setup(pin=%s, mode=%s)", self._prefix, pin, mode)
+
+    def output(self, pin, state):
+        logger.info("[%s] %soutput(pin=%s, state=%s)", self._prefix,
+                    self._emojis.get("output", ""), pin, "HIGH" if state == 1 else "LOW")
+
+    def input(self, pin):
+        logger.debug("[%s] input(pin=%s)", self._prefix, pin)
+        return 0
+
+    def cleanup(self):
+        logger.debug("[%s] cleanup()", self._prefix)
+
+
+if config.SIMULATE_HARDWARE:
+    # Simulation replaces GPIO below anyway - only probe for RPi.GPIO, don't
+    # import it (importing it off-Pi raises, and on-Pi it maps /dev/gpiomem)
+    try:
+        GPIO_AVAILABLE = importlib.util.find_spec("RPi.GPIO") is not None
+    except ImportError:
+        GPIO_AVAILABLE = False
+else:
+    # Try to import RPi.GPIO, fall back to mock if not available
+    try:
+        import RPi.GPIO as GPIO
+        GPIO_AVAILABLE = True
+        logger.debug("✅ RPi.GPIO imported successfully")
+    except ImportError:
+        GPIO_AVAILABLE = False
+        logger.warning("⚠️  RPi.GPIO not available - using simulation mode")
+
+        # Mock GPIO module for testing on non-Pi systems
+        GPIO = _FakeGPIO("MOCK GPIO")
 
 # Use mock GPIO if in simulation mode
 if config.SIMULATE_HARDWARE:
     logger.info("🎭 SIMULATION MODE ENABLED - Using mock GPIO")
-    class SimulatedGPIO:
-        """Simulated GPIO for testing"""
-        BCM = "BCM"
-        OUT = "OUT"
-        IN = "IN"
-        HIGH = 1
-        LOW = 0
-        
-        @staticmethod
-        def setmode(mode):
-            logger.debug(f"[SIMULATED GPIO] setmode({mode})")
-        
-        @staticmethod
-        def setup(pin, mode):
-            logger.info(f"[SIMULATED GPIO] setup(pin={pin}, mode={mode})")
-        
-        @staticmethod
-        def output(pin, state):
-            state_str = "HIGH" if state == 1 else "LOW"
-            logger.info(f"[SIMULATED GPIO] 🔌 output(pin={pin}, state={state_str})")
-        
-        @staticmethod
-        def input(pin):
-            logger.debug(f"[SIMULATED GPIO] input(pin={pin})")
-            return 0
-        
-        @staticmethod
-        def cleanup():
-            logger.debug(f"[SIMULATED GPIO] cleanup()")
-        
-        class PWM:
-            def __init__(self, pin, frequency):
-                self.pin = pin
-                self.frequency = frequency
-                logger.info(f"[SIMULATED GPIO] 📊 PWM(pin={pin}, frequency={frequency}Hz)")
-            
-            def start(self, duty_cycle):
-                logger.info(f"[SIMULATED GPIO] ⚡ PWM.start(pin={self.pin}, duty_cycle={duty_cycle}%)")
-            
-            def ChangeDutyCycle(self, duty_cycle):
-                logger.info(f"[SIMULATED GPIO] ⚡ PWM.ChangeDutyCycle(pin={self.pin}, duty_cycle={duty_cycle}%)")
-            
-            def stop(self):
-                logger.info(f"[SIMULATED GPIO] ⏹️  PWM.stop(pin={self.pin})")
-    
-    GPIO = SimulatedGPIO()
+    GPIO = _FakeGPIO(
+        "SIMULATED GPIO",
+        emojis={"output": "🔌 ", "pwm": "📊 ", "pwm_start": "⚡ ", "pwm_duty": "⚡ ", "pwm_stop": "⏹️  "},
+        setup_level=logging.INFO,
+    )
 
 __all__ = ['GPIO', 'GPIO_AVAILABLE']
@@ -26,10 +26,46 @@ NON-DESTRUCTIVE INITIALIZATION:
 from typing import Dict, Optional, Tuple
 from enum import Enum
 from datetime import datetime
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Hardcoded names from the old pin config (before smart naming)
+_OLD_DEFAULT_NAMES = frozenset({
+    "Pump PWM", "Pump Relay", "LED PWM", "LED Relay",
+    "DHT22 (Temp/Humidity)", "Water Level Sensor",
+})
+
+# Old hardcoded name per GPIO (takes precedence over motor pin roles)
+_LEGACY_PIN_NAMES = {
+    17: "Pump PWM",
+    19: "Pump Relay",
+    18: "LED PWM",
+    13: "LED Relay",
+    4: "DHT22 (Temp/Humidity)",
+    27: "Water Level Sensor",
+}
+
+# Old motor pin roles ("Motor {tray} {kind}")
+_LEGACY_MOTOR_PIN_KIND = {
+    2: "PWM",
+    12: "PWM",
+    3: "Direction",
+    13: "Direction",
+    5: "Home Sensor",
+    6: "End Sensor",
+}
+
+# Upper-cased device types used in default names (avoids .upper() per call)
+_DEVICE_TYPE_UPPER = {
+    "pump": "PUMP",
+    "light": "LIGHT",
+    "motor": "MOTOR",
+    "sensor": "SENSOR",
+    "custom": "CUSTOM",
+}
+
 
 class GPIOCapability(Enum):
     """GPIO hardware capabilities"""
@@ -45,6 +81,10 @@ class GPIOCapability(Enum):
     CUSTOM = "Custom Device"
 
 
+# Capability label per enum member (Enum.value is a descriptor lookup)
+_CAPABILITY_LABELS = {cap: cap.value for cap in GPIOCapability}
+
+
 class GPIOCapabilityMap:
     """Map GPIO numbers to their typical capabilities and hardware info"""
     
@@ -58,89 +98,180 @@ class GPIOCapabilityMap:
         27: 13, 28: 5, 29: 0, 30: 0, 31: 0,
     }
     
+    # Same mapping as a tuple indexed by GPIO number (None = no physical pin)
+    GPIO_TO_PHYSICAL_PIN_LUT = tuple(map(GPIO_TO_PHYSICAL_PIN.get, range(40)))
+    
     # GPIO pins reserved for I2C/SPI (shouldn't be used for general GPIO)
     RESERVED_PINS = {2, 3}  # I2C pins
     
-    # Typical allocation for HarvestPilot system
-    TYPICAL_ALLOCATION = {
-        17: {
+    # Typical allocation for HarvestPilot system, tagged by hardware module.
+    # A GPIO can appear once per module (e.g. GPIO13 is the LED relay on the
+    # grow module but the secondary motor direction on the motor module).
+    TYPICAL_ALLOCATIONS = [
+        {
+            "gpio": 17,
+            "module": "grow",
             "device_type": "pump",
             "primary_capability": GPIOCapability.PWM,
             "description": "Irrigation System"
         },
-        19: {
+        {
+            "gpio": 19,
+            "module": "grow",
             "device_type": "pump",
             "primary_capability": GPIOCapability.RELAY,
             "description": "Pump Relay Control"
         },
-        18: {
+        {
+            "gpio": 18,
+            "module": "grow",
             "device_type": "light",
             "primary_capability": GPIOCapability.PWM,
             "description": "LED Strip Lighting"
         },
-        13: {
+        {
+            "gpio": 13,
+            "module": "grow",
             "device_type": "light",
             "primary_capability": GPIOCapability.RELAY,
             "description": "LED Relay Control"
         },
-        4: {
+        {
+            "gpio": 4,
+            "module": "grow",
             "device_type": "sensor",
             "primary_capability": GPIOCapability.DHT_SENSOR,
             "description": "Environment Monitoring"
         },
-        27: {
+        {
+            "gpio": 27,
+            "module": "grow",
             "device_type": "sensor",
             "primary_capability": GPIOCapability.WATER_LEVEL,
             "description": "Water Level Monitoring"
         },
-        2: {
+        {
+            "gpio": 2,
+            "module": "motor",
             "device_type": "motor",
             "primary_capability": GPIOCapability.MOTOR_PWM,
             "description": "Harvest Motor Control"
         },
-        3: {
+        {
+            "gpio": 3,
+            "module": "motor",
             "device_type": "motor",
             "primary_capability": GPIOCapability.MOTOR_DIRECTION,
             "description": "Harvest Motor Direction"
         },
-        5: {
+        {
+            "gpio": 5,
+            "module": "motor",
             "device_type": "motor",
             "primary_capability": GPIOCapability.MOTOR_SENSOR,
             "description": "Harvest Motor Home Sensor"
         },
-        6: {
+        {
+            "gpio": 6,
+            "module": "motor",
             "device_type": "motor",
             "primary_capability": GPIOCapability.MOTOR_SENSOR,
             "description": "Harvest Motor End Sensor"
         },
-        12: {
+        {
+            "gpio": 12,
+            "module": "motor",
             "device_type": "motor",
             "primary_capability": GPIOCapability.MOTOR_PWM,
             "description": "Secondary Motor Control"
         },
-        13: {
+        {
+            "gpio": 13,
+            "module": "motor",
             "device_type": "motor",
             "primary_capability": GPIOCapability.MOTOR_DIRECTION,
             "description": "Secondary Motor Direction"
         },
+    ]
+    
+    # Per-module GPIO -> allocation indexes (values keep only the allocation
+    # fields, not the "gpio"/"module" lookup keys)
+    BY_GPIO_GROW_MODULE = {
+        a["gpio"]: {k: v for k, v in a.items() if k not in ("gpio", "module")}
+        for a in TYPICAL_ALLOCATIONS if a["module"] == "grow"
+    }
+    BY_GPIO_MOTOR_MODULE = {
+        a["gpio"]: {k: v for k, v in a.items() if k not in ("gpio", "module")}
+        for a in TYPICAL_ALLOCATIONS if a["module"] == "motor"
+    }
+    
+    # Combined view when the module is unknown (motor module wins on shared GPIOs)
+    TYPICAL_ALLOCATION = {**BY_GPIO_GROW_MODULE, **BY_GPIO_MOTOR_MODULE}
+    
+    MODULE_ALLOCATIONS = {
+        "grow": BY_GPIO_GROW_MODULE,
+        "motor": BY_GPIO_MOTOR_MODULE,
     }
+    
+    @staticmethod
+    def build_info_lut(allocation: Dict[int, Dict]) -> Tuple:
+        """(physical_pin, is_reserved, typical_allocation) per GPIO number 0-39"""
+        return tuple(
+            (
+                GPIOCapabilityMap.GPIO_TO_PHYSICAL_PIN.get(gpio_number),
+                gpio_number in GPIOCapabilityMap.RESERVED_PINS,
+                allocation.get(gpio_number),
+            )
+            for gpio_number in range(40)
+        )
+
+
+# Info LUT for the combined allocation (shared by namers without a module kind)
+GPIOCapabilityMap.GPIO_INFO_LUT = GPIOCapabilityMap.build_info_lut(
+    GPIOCapabilityMap.TYPICAL_ALLOCATION
+)
 
 
 class GPIONamer:
     """Generate intelligent GPIO names based on number + capabilities"""
     
-    def __init__(self):
+    def __init__(self, module_kind: Optional[str] = None):
+        """
+        Args:
+            module_kind: Hardware module ("grow" or "motor") used to resolve
+                typical allocations; None uses the combined table
+        """
         self.capability_map = GPIOCapabilityMap()
+        self._module_kind = module_kind
+        if module_kind is None:
+            self._allocation = self.capability_map.TYPICAL_ALLOCATION
+            self._info_lut = self.capability_map.GPIO_INFO_LUT
+        elif module_kind in self.capability_map.MODULE_ALLOCATIONS:
+            self._allocation = self.capability_map.MODULE_ALLOCATIONS[module_kind]
+            self._info_lut = self.capability_map.build_info_lut(self._allocation)
+        else:
+            raise ValueError(f"Unknown module kind: {module_kind}")
+        # Default names for the known allocation - looked up on first use
+        self._typical_default_names_cache: Optional[Dict[int, str]] = None
+    
+    @property
+    def _typical_default_names(self) -> Dict[int, str]:
+        """Default names for the typical allocation (they never change)"""
+        if self._typical_default_names_cache is None:
+            self._typical_default_names_cache = _shared_default_names(self._module_kind)
+        return self._typical_default_names_cache
     
     def get_physical_pin(self, gpio_number: int) -> Optional[int]:
         """Get physical pin number for a GPIO number"""
-        return self.capability_map.GPIO_TO_PHYSICAL_PIN.get(gpio_number)
+        lut = self.capability_map.GPIO_TO_PHYSICAL_PIN_LUT
+        return lut[gpio_number] if 0 <= gpio_number < len(lut) else None
     
     def get_gpio_info(self, gpio_number: int) -> Dict:
         """Get all known information about a GPIO pin"""
-        physical_pin = self.get_physical_pin(gpio_number)
-        typical = self.capability_map.TYPICAL_ALLOCATION.get(gpio_number)
-        is_reserved = gpio_number in self.capability_map.RESERVED_PINS
+        if 0 <= gpio_number < len(self._info_lut):
+            physical_pin, is_reserved, typical = self._info_lut[gpio_number]
+        else:
+            physical_pin, is_reserved, typical = None, False, None
         
         info = {
             "gpio_number": gpio_number,
@@ -170,24 +301,36 @@ class GPIONamer:
         Returns:
             Human-readable default name for the GPIO
         """
+        if device_type is None and capability is None:
+            name = self._typical_default_names.get(gpio_number)
+            if name is not None:
+                return name
+        return _cached_default_name(self._module_kind, gpio_number, device_type, capability)
+    
+    def _build_default_name(
+        self,
+        gpio_number: int,
+        device_type: Optional[str],
+        capability: Optional[str]
+    ) -> str:
         physical_pin = self.get_physical_pin(gpio_number)
         if physical_pin is None:
             return f"GPIO{gpio_number} - UNKNOWN PIN"
         
         # Get typical allocation info
-        typical = self.capability_map.TYPICAL_ALLOCATION.get(gpio_number)
+        typical = self._allocation.get(gpio_number)
         
         if device_type is None and typical:
-            device_type = typical.get("device_type", "custom").upper()
-        elif device_type:
-            device_type = device_type.upper()
+            device_type = typical.get("device_type", "custom")
+        if device_type:
+            device_type = _DEVICE_TYPE_UPPER.get(device_type) or device_type.upper()
         else:
             device_type = "CUSTOM"
         
         if capability is None and typical:
             cap = typical.get("primary_capability")
             if cap:
-                capability = cap.value
+                capability = _CAPABILITY_LABELS[cap]
         elif capability is None:
             capability = "General Purpose I/O"
         
@@ -212,46 +355,66 @@ class GPIONamer:
         Returns:
             Legacy-style name
         """
-        mappings = {
-            17: "Pump PWM",
-            19: "Pump Relay",
-            18: "LED PWM",
-            13: "LED Relay",
-        }
-        
-        if gpio_number in mappings:
-            return mappings[gpio_number]
+        name = _LEGACY_PIN_NAMES.get(gpio_number)
+        if name is not None:
+            return name
         
         if device_type == "motor" and motor_tray:
-            # Motor pin - figure out if PWM, dir, home, or end
-            if gpio_number in [2, 12]:
-                return f"Motor {motor_tray} PWM"
-            elif gpio_number in [3, 13]:
-                return f"Motor {motor_tray} Direction"
-            elif gpio_number in [5]:
-                return f"Motor {motor_tray} Home Sensor"
-            elif gpio_number in [6]:
-                return f"Motor {motor_tray} End Sensor"
-        
-        if gpio_number == 4:
-            return "DHT22 (Temp/Humidity)"
-        elif gpio_number == 27:
-            return "Water Level Sensor"
+            # Motor pin - PWM, direction, home or end sensor
+            kind = _LEGACY_MOTOR_PIN_KIND.get(gpio_number)
+            if kind is not None:
+                return f"Motor {motor_tray} {kind}"
         
         return f"GPIO {gpio_number} (Unknown)"
 
 
+@functools.lru_cache(maxsize=None)
+def _namer_for(module_kind: Optional[str]) -> GPIONamer:
+    """One GPIONamer per module kind, used to build the shared name caches"""
+    return GPIONamer(module_kind)
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_default_names(module_kind: Optional[str]) -> Dict[int, str]:
+    """Typical-allocation default names per module kind, built once per process.
+
+    Shared by every GPIONamer of that kind (the actuator controller alone
+    holds two). Callers must treat the dict as read-only.
+    """
+    namer = _namer_for(module_kind)
+    return {
+        gpio_number: namer._build_default_name(gpio_number, None, None)
+        for gpio_number in namer._allocation
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_default_name(
+    module_kind: Optional[str],
+    gpio_number: int,
+    device_type: Optional[str],
+    capability: Optional[str]
+) -> str:
+    """Default name for an explicit device_type/capability combination.
+
+    Names depend only on these arguments and the static allocation tables,
+    and the domain is small (GPIOs x device types), so results are memoized.
+    """
+    return _namer_for(module_kind)._build_default_name(gpio_number, device_type, capability)
+
+
 class GPIONameManager:
     """Manage GPIO names with user customization tracking"""
     
-    def __init__(self):
-        self.namer = GPIONamer()
+    def __init__(self, module_kind: Optional[str] = None):
+        self.namer = GPIONamer(module_kind)
     
     def create_firestore_entry(
         self,
         gpio_number: int,
         device_type: Optional[str] = None,
-        user_custom_name: Optional[str] = None
+        user_custom_name: Optional[str] = None,
+        now_iso: Optional[str] = None
     ) -> Dict:
         """
         Create a Firestore-ready GPIO entry with smart naming.
@@ -263,18 +426,18 @@ class GPIONameManager:
             gpio_number: GPIO number
             device_type: Device type if known
             user_custom_name: If user provided a custom name
+            now_iso: Timestamp to reuse across a batch (defaults to now)
             
         Returns:
             Dictionary ready for Firestore gpioState.{pin} field
         """
         physical_pin = self.namer.get_physical_pin(gpio_number)
-        now = datetime.now().isoformat()
         
         if user_custom_name:
             # User provided a custom name
             name = user_custom_name
             name_customized = True
-            customized_at = now
+            customized_at = now_iso or datetime.now().isoformat()
             default_name = self.namer.generate_default_name(gpio_number, device_type)
         else:
             # Generate smart default
@@ -323,12 +486,7 @@ class GPIONameManager:
             return False, "No name set yet"
         
         # Check if it looks like an old default (hardcoded like "Pump PWM")
-        old_defaults = {
-            "Pump PWM", "Pump Relay", "LED PWM", "LED Relay",
-            "DHT22 (Temp/Humidity)", "Water Level Sensor"
-        }
-        
-        if existing_name in old_defaults or "Motor" in existing_name:
+        if existing_name in _OLD_DEFAULT_NAMES or "Motor" in existing_name:
             return False, f"Old default name: {existing_name} (can update)"
         
         # Looks custom-ish but not marked - preserve for safety
@@ -338,7 +496,8 @@ class GPIONameManager:
         self,
         gpio_number: int,
         existing_pin_data: Optional[Dict],
-        device_type: Optional[str] = None
+        device_type: Optional[str] = None,
+        now_iso: Optional[str] = None
     ) -> Dict:
         """
         Update or create pin entry with smart naming.
@@ -349,6 +508,7 @@ class GPIONameManager:
             gpio_number: GPIO number
             existing_pin_data: Current Firestore data for pin (or None if new)
             device_type: Device type if known
+            now_iso: Timestamp to reuse across a batch (defaults to now)
             
         Returns:
             Updated entry dict
@@ -363,13 +523,14 @@ class GPIONameManager:
         
         # Generate smart default name
         logger.info(f"GPIO{gpio_number}: Creating smart default name")
-        return self.create_firestore_entry(gpio_number, device_type)
+        return self.create_firestore_entry(gpio_number, device_type, now_iso=now_iso)
     
     def rename_gpio_pin(
         self,
         gpio_number: int,
         new_name: str,
-        existing_pin_data: Dict
+        existing_pin_data: Dict,
+        now_iso: Optional[str] = None
     ) -> Dict:
         """
         Safely rename a GPIO pin, marking it as user-customized.
@@ -378,15 +539,22 @@ class GPIONameManager:
             gpio_number: GPIO number
             new_name: User-provided new name
             existing_pin_data: Current pin data from Firestore
+            now_iso: Timestamp to reuse across a batch (defaults to now)
             
         Returns:
-            Updated entry dict
+            Updated entry dict (existing_pin_data itself if the name is unchanged)
         """
         if not new_name or not new_name.strip():
             raise ValueError("Custom name cannot be empty")
         
         new_name = new_name.strip()
-        now = datetime.now().isoformat()
+        
+        # Already customized to this exact name - nothing to write
+        if existing_pin_data.get("name_customized") and existing_pin_data.get("name") == new_name:
+            logger.debug("GPIO%s: Already named '%s' (customized), unchanged", gpio_number, new_name)
+            return existing_pin_data
+        
+        now = now_iso or datetime.now().isoformat()
         
         # Preserve smart defaults if needed
         device_type = existing_pin_data.get("device_type")
@@ -395,13 +563,12 @@ class GPIONameManager:
             self.namer.generate_default_name(gpio_number, device_type)
         )
         
-        updated = {
-            **existing_pin_data,
-            "name": new_name,
-            "default_name": default_name,
-            "name_customized": True,
-            "customized_at": now,
-        }
+        # Shallow copy so the caller's snapshot isn't mutated
+        updated = existing_pin_data.copy()
+        updated["name"] = new_name
+        updated["default_name"] = default_name
+        updated["name_customized"] = True
+        updated["customized_at"] = now
         
         logger.info(f"GPIO{gpio_number}: Renamed to '{new_name}' (marked as customized)")
         return updated
@@ -419,17 +586,23 @@ class GPIONameManager:
             existing_pin_data: Current pin data from Firestore
             
         Returns:
-            Updated entry dict
+            Updated entry dict (existing_pin_data itself if already at the default)
         """
         device_type = existing_pin_data.get("device_type")
         smart_name = self.namer.generate_default_name(gpio_number, device_type)
         
-        updated = {
-            **existing_pin_data,
-            "name": smart_name,
-            "default_name": smart_name,
-            "name_customized": False,
-        }
+        # Already on the smart default - nothing to write
+        if (existing_pin_data.get("name_customized") is False
+                and existing_pin_data.get("name") == smart_name
+                and existing_pin_data.get("default_name") == smart_name
+                and "customized_at" not in existing_pin_data):
+            logger.debug("GPIO%s: Already at smart default, unchanged", gpio_number)
+            return existing_pin_data
+        
+        updated = existing_pin_data.copy()
+        updated["name"] = smart_name
+        updated["default_name"] = smart_name
+        updated["name_customized"] = False
         
         # Remove customization metadata
         updated.pop("customized_at", None)
@@ -1,39 +1,53 @@
 """Logger setup for RaspServer"""
 
 import logging
+import logging.handlers
 import sys
 from .. import config
 
+# Shared by every handler - built once
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Rotate the log file so it can't fill the SD card
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 3
+
+_configured = False
+
 
 def setup_logging():
-    """Setup logging configuration"""
-    
+    """Setup logging configuration (safe to call more than once)"""
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
     # Create logger
     logger = logging.getLogger()
     logger.setLevel(config.LOG_LEVEL)
-    
-    # Console handler
+
+    # Console handler (level comes from the root logger)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(config.LOG_LEVEL)
-    
-    # Format
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(_FORMATTER)
     logger.addHandler(console_handler)
-    
+
     # File handler
     try:
         import os
         os.makedirs('logs', exist_ok=True)
-        file_handler = logging.FileHandler(config.LOG_FILE)
+        file_handler = logging.handlers.RotatingFileHandler(
+            config.LOG_FILE,
+            maxBytes=LOG_FILE_MAX_BYTES,
+            backupCount=LOG_FILE_BACKUP_COUNT,
+            delay=True,
+        )
         file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(_FORMATTER)
         logger.addHandler(file_handler)
     except Exception as e:
         logger.warning(f"Could not create file handler: {e}")
-    
+
     logger.info("Logging configured")
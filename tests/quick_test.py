@@ -10,6 +10,16 @@ import sys
 import os
 from pathlib import Path
 
+# Checked once at startup (options 2 and 3 both need the harness)
+HARNESS_FILE = Path('test_local_firebase_commands.py')
+HARNESS_EXISTS = HARNESS_FILE.exists()
+
+# Environment for every child run (simulation mode on)
+SIM_ENV = {**os.environ, 'SIMULATE_HARDWARE': 'true'}
+
+# Rule line for the section banners
+BAR = "=" * 80
+
 print("""
 ╔════════════════════════════════════════════════════════════════════════════╗
 ║                  HARVEST PILOT - QUICK START TEST                          ║
@@ -35,51 +45,55 @@ WHAT YOU'LL TEST:
 OPTIONS:
 """)
 
-print("1. Run server only (manual testing via Firebase console)")
-print("2. Run automated test suite (full end-to-end test)")
-print("3. Run interactive test menu (send commands manually)")
-print("4. View detailed testing guide")
-print("0. Exit")
-print()
+print(
+    "1. Run server only (manual testing via Firebase console)",
+    "2. Run automated test suite (full end-to-end test)",
+    "3. Run interactive test menu (send commands manually)",
+    "4. View detailed testing guide",
+    "0. Exit",
+    "",
+    sep="\n",
+)
 
 choice = input("Select option (0-4): ").strip()
 
 def run_server():
     """Run the server locally"""
-    print("\n" + "="*80)
-    print("Starting RaspServer in SIMULATION MODE...")
-    print("="*80)
-    print("\nThe server will:")
-    print("  ✓ Initialize Firebase connection")
-    print("  ✓ Register device")
-    print("  ✓ Start listening for commands")
-    print("  ✓ Log all activity to console and logs/raspserver.log")
-    print("\nPress Ctrl+C to stop the server")
-    print("="*80 + "\n")
+    print(
+        "\n" + BAR,
+        "Starting RaspServer in SIMULATION MODE...",
+        BAR,
+        "\nThe server will:",
+        "  ✓ Initialize Firebase connection",
+        "  ✓ Register device",
+        "  ✓ Start listening for commands",
+        "  ✓ Log all activity to console and logs/raspserver.log",
+        "\nPress Ctrl+C to stop the server",
+        BAR + "\n",
+        sep="\n",
+    )
     
-    env = os.environ.copy()
-    env['SIMULATE_HARDWARE'] = 'true'
-    subprocess.run([sys.executable, 'main.py'], env=env)
+    if os.name == 'posix':
+        # Nothing runs after the server, so replace this process instead of
+        # keeping a second interpreter around (output stays on this TTY)
+        sys.stdout.flush()
+        os.execvpe(sys.executable, [sys.executable, 'main.py'], SIM_ENV)
+    subprocess.run([sys.executable, 'main.py'], env=SIM_ENV)
 
 def run_tests():
     """Run test suite"""
-    print("\n" + "="*80)
-    print("Running Automated Test Suite...")
-    print("="*80 + "\n")
+    print("\n" + BAR, "Running Automated Test Suite...", BAR + "\n", sep="\n")
     
-    if not Path('test_local_firebase_commands.py').exists():
+    if not HARNESS_EXISTS:
         print("❌ Error: test_local_firebase_commands.py not found")
         print("Make sure you're in the harvestpilot-raspserver directory")
         sys.exit(1)
     
-    env = os.environ.copy()
-    env['SIMULATE_HARDWARE'] = 'true'
-    
     # Run non-interactively
     subprocess.run([
         sys.executable, 
-        'test_local_firebase_commands.py'
-    ], env=env, input=b'n\n')
+        str(HARNESS_FILE)
+    ], env=SIM_ENV, input=b'n\n')
 
 def show_guide():
     """Show testing guide"""
@@ -90,33 +104,32 @@ def show_guide():
     else:
         print("❌ Testing guide not found")
 
-if choice == '1':
-    run_server()
+def run_interactive():
+    """Run the harness's interactive command menu"""
+    print("\n" + BAR, "Starting Interactive Test Mode...", BAR + "\n", sep="\n")
     
-elif choice == '2':
-    run_tests()
-    
-elif choice == '3':
-    print("\n" + "="*80)
-    print("Starting Interactive Test Mode...")
-    print("="*80 + "\n")
-    
-    if not Path('test_local_firebase_commands.py').exists():
+    if not HARNESS_EXISTS:
         print("❌ Error: test_local_firebase_commands.py not found")
         sys.exit(1)
     
-    env = os.environ.copy()
-    env['SIMULATE_HARDWARE'] = 'true'
-    
-    subprocess.run([sys.executable, 'test_local_firebase_commands.py'], env=env)
-    
-elif choice == '4':
-    show_guide()
-    
-elif choice == '0':
+    subprocess.run([sys.executable, str(HARNESS_FILE)], env=SIM_ENV)
+
+def exit_quick_test():
+    """Leave without running anything"""
     print("Goodbye!")
     sys.exit(0)
-    
-else:
+
+# Menu option -> action
+OPTIONS = {
+    '1': run_server,
+    '2': run_tests,
+    '3': run_interactive,
+    '4': show_guide,
+    '0': exit_quick_test,
+}
+
+action = OPTIONS.get(choice)
+if action is None:
     print("Invalid choice")
     sys.exit(1)
+action()
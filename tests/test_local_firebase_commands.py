@@ -49,6 +49,27 @@ from src.core import RaspServer
 from src.services.firebase_listener import FirebaseDeviceListener
 from src.services.device_manager import DeviceManager
 
+# Banner rule for log and menu headers
+BAR = "=" * 80
+
+# Interactive menu, printed before every prompt (built once)
+MENU_TEXT = "\n".join([
+    "\n" + BAR,
+    "🧪 LOCAL FIREBASE TEST MENU",
+    BAR,
+    "1. GPIO Pin ON (GPIO 17)",
+    "2. GPIO Pin OFF (GPIO 17)",
+    "3. GPIO Pin ON with 5s duration (GPIO 27)",
+    "4. Pump START (80% speed)",
+    "5. Pump STOP",
+    "6. Pump PULSE (5s)",
+    "7. Lights ON (100% brightness)",
+    "8. Lights OFF",
+    "9. Lights ON (50% brightness)",
+    "0. Exit",
+    BAR,
+])
+
 
 class LocalTestHarness:
     """Harness for testing Firebase commands locally"""
@@ -59,11 +80,24 @@ class LocalTestHarness:
         self.firebase_listener = None
         self.command_counter = 0
         
+        # Interactive menu choice -> (log line, coroutine factory); "0" exits
+        self._menu_actions: Dict[str, Any] = {
+            "1": ("🔌 Testing GPIO 17 ON", lambda: self.send_pin_control_command(17, "on")),
+            "2": ("🔌 Testing GPIO 17 OFF", lambda: self.send_pin_control_command(17, "off")),
+            "3": ("🔌 Testing GPIO 27 ON with 5s auto-off", self._pin_on_with_auto_off),
+            "4": ("💧 Testing Pump START", lambda: self.send_pump_command("start", speed=80)),
+            "5": ("💧 Testing Pump STOP", lambda: self.send_pump_command("stop")),
+            "6": ("💧 Testing Pump PULSE", self._pump_pulse),
+            "7": ("💡 Testing Lights ON (100%)", lambda: self.send_lights_command("on", brightness=100)),
+            "8": ("💡 Testing Lights OFF", lambda: self.send_lights_command("off")),
+            "9": ("💡 Testing Lights ON (50%)", lambda: self.send_lights_command("on", brightness=50)),
+        }
+        
     async def setup(self):
         """Setup test environment"""
-        logger.info("=" * 80)
+        logger.info(BAR)
         logger.info("🧪 LOCAL FIREBASE TEST HARNESS - INITIALIZING")
-        logger.info("=" * 80)
+        logger.info(BAR)
         
         try:
             logger.info(f"Configuration:")
@@ -96,9 +130,9 @@ class LocalTestHarness:
         if duration:
             command["duration"] = duration
         
-        logger.info("=" * 80)
+        logger.info(BAR)
         logger.info(f"📤 SENDING TEST COMMAND #{self.command_counter}")
-        logger.info("=" * 80)
+        logger.info(BAR)
         logger.info(f"Command: {json.dumps(command, indent=2)}")
         logger.info("-" * 80)
         
@@ -107,7 +141,7 @@ class LocalTestHarness:
             logger.info("🎬 Simulating Firebase command reception...")
             await self.firebase_listener._process_command(command)
         
-        logger.info("=" * 80)
+        logger.info(BAR)
         await asyncio.sleep(1)  # Give time for logging to finish
     
     async def send_pump_command(self, action: str, speed: int = 80, duration: int = None):
@@ -125,9 +159,9 @@ class LocalTestHarness:
         if duration:
             command["duration"] = duration
         
-        logger.info("=" * 80)
+        logger.info(BAR)
         logger.info(f"📤 SENDING TEST COMMAND #{self.command_counter} - PUMP CONTROL")
-        logger.info("=" * 80)
+        logger.info(BAR)
         logger.info(f"Command: {json.dumps(command, indent=2)}")
         logger.info("-" * 80)
         
@@ -135,7 +169,7 @@ class LocalTestHarness:
             logger.info("🎬 Simulating Firebase command reception...")
             await self.firebase_listener._process_command(command)
         
-        logger.info("=" * 80)
+        logger.info(BAR)
         await asyncio.sleep(1)
     
     async def send_lights_command(self, action: str, brightness: int = 100):
@@ -150,9 +184,9 @@ class LocalTestHarness:
             "brightness": brightness,
         }
         
-        logger.info("=" * 80)
+        logger.info(BAR)
         logger.info(f"📤 SENDING TEST COMMAND #{self.command_counter} - LIGHTS CONTROL")
-        logger.info("=" * 80)
+        logger.info(BAR)
         logger.info(f"Command: {json.dumps(command, indent=2)}")
         logger.info("-" * 80)
         
@@ -160,25 +194,12 @@ class LocalTestHarness:
             logger.info("🎬 Simulating Firebase command reception...")
             await self.firebase_listener._process_command(command)
         
-        logger.info("=" * 80)
+        logger.info(BAR)
         await asyncio.sleep(1)
     
     def show_menu(self):
         """Show test menu"""
-        print("\n" + "=" * 80)
-        print("🧪 LOCAL FIREBASE TEST MENU")
-        print("=" * 80)
-        print("1. GPIO Pin ON (GPIO 17)")
-        print("2. GPIO Pin OFF (GPIO 17)")
-        print("3. GPIO Pin ON with 5s duration (GPIO 27)")
-        print("4. Pump START (80% speed)")
-        print("5. Pump STOP")
-        print("6. Pump PULSE (5s)")
-        print("7. Lights ON (100% brightness)")
-        print("8. Lights OFF")
-        print("9. Lights ON (50% brightness)")
-        print("0. Exit")
-        print("=" * 80)
+        print(MENU_TEXT)
     
     async def run_interactive(self):
         """Run interactive test menu"""
@@ -189,100 +210,92 @@ class LocalTestHarness:
             self.show_menu()
             choice = input("Enter choice (0-9): ").strip()
             
+            if choice == "0":
+                logger.info("👋 Exiting interactive mode...")
+                break
+            
+            action = self._menu_actions.get(choice)
+            if action is None:
+                print("Invalid choice. Please try again.")
+                continue
+            
+            label, run = action
             try:
-                if choice == "1":
-                    logger.info("🔌 Testing GPIO 17 ON")
-                    await self.send_pin_control_command(17, "on")
-                    
-                elif choice == "2":
-                    logger.info("🔌 Testing GPIO 17 OFF")
-                    await self.send_pin_control_command(17, "off")
-                    
-                elif choice == "3":
-                    logger.info("🔌 Testing GPIO 27 ON with 5s auto-off")
-                    await self.send_pin_control_command(27, "on", duration=5)
-                    logger.info("⏳ Waiting 6 seconds to see auto-off...")
-                    await asyncio.sleep(6)
-                    
-                elif choice == "4":
-                    logger.info("💧 Testing Pump START")
-                    await self.send_pump_command("start", speed=80)
-                    
-                elif choice == "5":
-                    logger.info("💧 Testing Pump STOP")
-                    await self.send_pump_command("stop")
-                    
-                elif choice == "6":
-                    logger.info("💧 Testing Pump PULSE")
-                    await self.send_pump_command("pulse", duration=5)
-                    logger.info("⏳ Waiting for pulse to complete...")
-                    await asyncio.sleep(6)
-                    
-                elif choice == "7":
-                    logger.info("💡 Testing Lights ON (100%)")
-                    await self.send_lights_command("on", brightness=100)
-                    
-                elif choice == "8":
-                    logger.info("💡 Testing Lights OFF")
-                    await self.send_lights_command("off")
-                    
-                elif choice == "9":
-                    logger.info("💡 Testing Lights ON (50%)")
-                    await self.send_lights_command("on", brightness=50)
-                    
-                elif choice == "0":
-                    logger.info("👋 Exiting interactive mode...")
-                    break
-                    
-                else:
-                    print("Invalid choice. Please try again.")
-                    
+                logger.info(label)
+                await run()
             except Exception as e:
                 logger.error(f"❌ Error processing command: {e}", exc_info=True)
     
+    async def _pin_on_with_auto_off(self):
+        """Menu 3: GPIO 27 ON for 5s, then wait to see the auto-off"""
+        await self.send_pin_control_command(27, "on", duration=5)
+        logger.info("⏳ Waiting 6 seconds to see auto-off...")
+        await asyncio.sleep(6)
+    
+    async def _pump_pulse(self):
+        """Menu 6: 5s pump pulse, then wait for it to finish"""
+        await self.send_pump_command("pulse", duration=5)
+        logger.info("⏳ Waiting for pulse to complete...")
+        await asyncio.sleep(6)
+    
     async def run_automated_test_sequence(self):
         """Run a pre-programmed test sequence"""
-        logger.info("\n" + "=" * 80)
+        logger.info("\n" + BAR)
         logger.info("🤖 RUNNING AUTOMATED TEST SEQUENCE")
-        logger.info("=" * 80)
+        logger.info(BAR)
         
         try:
-            # Test 1: GPIO Pin Control
-            logger.info("\n[TEST 1/6] Testing GPIO Pin Control - ON")
-            await self.send_pin_control_command(17, "on")
-            await asyncio.sleep(2)
-            
-            logger.info("[TEST 2/6] Testing GPIO Pin Control - OFF")
-            await self.send_pin_control_command(17, "off")
-            await asyncio.sleep(2)
+            # GPIO17 is the pump pin, so the pin and pump tests stay in
+            # sequence; only the lights test runs alongside them. Lights go
+            # first so the step headers are logged in execution order (its
+            # command blocks still interleave with tests 2-5)
+            await asyncio.gather(
+                self._test_lights_on_off(),
+                self._test_pin_then_pump(),
+            )
             
-            # Test 2: GPIO with duration
-            logger.info("[TEST 3/6] Testing GPIO Pin Control with auto-off (5s)")
+            # Test 6: GPIO with duration (timer-based, kept on its own)
+            logger.info("[TEST 6/6] Testing GPIO Pin Control with auto-off (5s)")
             await self.send_pin_control_command(27, "on", duration=5)
             await asyncio.sleep(7)
             
-            # Test 3: Pump control
-            logger.info("[TEST 4/6] Testing Pump START")
-            await self.send_pump_command("start", speed=80)
-            await asyncio.sleep(2)
-            
-            logger.info("[TEST 5/6] Testing Pump STOP")
-            await self.send_pump_command("stop")
-            await asyncio.sleep(2)
-            
-            # Test 4: Lights control
-            logger.info("[TEST 6/6] Testing Lights ON/OFF")
-            await self.send_lights_command("on", brightness=100)
-            await asyncio.sleep(2)
-            await self.send_lights_command("off")
-            
-            logger.info("\n" + "=" * 80)
+            logger.info("\n" + BAR)
             logger.info("✅ AUTOMATED TEST SEQUENCE COMPLETE")
-            logger.info("=" * 80)
+            logger.info(BAR)
             
         except Exception as e:
             logger.error(f"❌ Error running automated tests: {e}", exc_info=True)
     
+    async def _test_lights_on_off(self):
+        """Test 1: Lights ON then OFF (runs alongside tests 2-5)"""
+        logger.info("\n[TEST 1/6] Testing Lights ON/OFF (alongside tests 2-5)")
+        await self.send_lights_command("on", brightness=100)
+        await asyncio.sleep(2)
+        await self.send_lights_command("off")
+    
+    async def _test_pin_then_pump(self):
+        """Tests 2/3 then 4/5 - both drive GPIO17, so never concurrently"""
+        await self._test_pin_on_off()
+        await self._test_pump_start_stop()
+    
+    async def _test_pin_on_off(self):
+        """Test 2/3: GPIO Pin Control (GPIO 17 ON then OFF)"""
+        logger.info("[TEST 2/6] Testing GPIO Pin Control - ON")
+        await self.send_pin_control_command(17, "on")
+        await asyncio.sleep(2)
+        
+        logger.info("[TEST 3/6] Testing GPIO Pin Control - OFF")
+        await self.send_pin_control_command(17, "off")
+    
+    async def _test_pump_start_stop(self):
+        """Test 4/5: Pump START then STOP"""
+        logger.info("[TEST 4/6] Testing Pump START")
+        await self.send_pump_command("start", speed=80)
+        await asyncio.sleep(2)
+        
+        logger.info("[TEST 5/6] Testing Pump STOP")
+        await self.send_pump_command("stop")
+    
     async def cleanup(self):
         """Cleanup resources"""
         logger.info("🔌 Cleaning up test harness...")